@@ -1,4 +1,5 @@
 import os
+import io
 import sys
 import re
 import random
@@ -8,10 +9,10 @@ import datetime
 import pytz
 import urllib
 import copy
+import json
 import atexit
 import asyncio
-import zlib
-import pickle
+import threading
 import concurrent
 import traceback
 
@@ -22,6 +23,20 @@ from google.cloud import firestore, error_reporting
 
 from assets import static_storage
 from helpers.utils import Utils
+from helpers.startup import StartupPhases
+from helpers.parser_index import ParserIndexSnapshot, ParserIndexCodec
+from helpers.commands import find_command, may_be_request
+from helpers.delivery import OrderedMessage
+from helpers.dataserver import RequestDeadlines
+from helpers.sketch import HeavyHitters
+from helpers.ratelimiter import RateLimiter
+from helpers.confirmations import ConfirmationRegistry
+from helpers.registry import SentMessageRegistry
+from helpers.cache import RequestCache, ChartCache, NegativeCache
+from helpers.writer import AccountWriter, merge_changes
+from helpers.database import AsyncDatabase, LoopGuard
+from helpers.snapshots import SnapshotQueue
+from helpers.accounts import AccountRecord, AccountSubscriptions
 from helpers import constants
 
 from TickerParser import TickerParser
@@ -37,7 +52,8 @@ from TickerParser import Exchange
 from TickerParser import supported
 
 
-database = firestore.Client()
+database = LoopGuard(firestore.Client())
+asyncDatabase = AsyncDatabase(database.client)
 stripe.api_key = os.environ["STRIPE_KEY"]
 
 
@@ -52,12 +68,33 @@ class Alpha(discord.AutoShardedClient):
 	accountProperties = {}
 	guildProperties = {}
 	accountIdMap = {}
+	isLoadingAccountsOnDemand = os.environ.get("ACCOUNT_LOADING") == "on demand"
+	accountSubscriptions = AccountSubscriptions(capacity=int(os.environ.get("ACCOUNT_CACHE_SIZE", 1000)))
+	unknownAccounts = NegativeCache(ttl=float(os.environ.get("ACCOUNT_LOOKUP_TTL", 60)))
+	snapshots = SnapshotQueue(batchSize=500)
 
 	statistics = {"alerts": 0, "alpha": 0, "c": 0, "convert": 0, "d": 0, "flow": 0, "hmap": 0, "mcap": 0, "t": 0, "mk": 0, "n": 0, "p": 0, "paper": 0, "v": 0, "x": 0}
-	rateLimited = {}
-	lockedUsers = set()
+	rateLimiter = RateLimiter(window=60)
+	rateLimited = rateLimiter.weights
+	confirmations = ConfirmationRegistry(timeout=60)
+	sentMessageRegistry = SentMessageRegistry(capacity=50000)
+	quoteCache = RequestCache(ttl=float(os.environ.get("QUOTE_CACHE_TTL", 5)), isCacheable=lambda response: response[0] is not None)
+	chartCache = ChartCache(maxSize=int(os.environ.get("CHART_CACHE_SIZE", 128)) * 1048576)
+	chartCacheMaxAge = int(os.environ.get("CHART_CACHE_MAX_AGE", 300))
+	dataServerDeadlines = RequestDeadlines({"chart": 30, "heatmap": 30, "depth": 20, "quote": 10}, timeout=60, busyThreshold=int(os.environ.get("DATA_SERVER_BUSY_THRESHOLD", 8)))
+	dataServerTimeoutText = "Data server didn't respond in time. You can try again in a bit."
+	unavailableResponses = NegativeCache(ttl=float(os.environ.get("NEGATIVE_CACHE_TTL", 30)))
+	accountWriter = AccountWriter(database.client, window=float(os.environ.get("ACCOUNT_WRITE_WINDOW", 1)))
+	heavyHitters = {"commands": HeavyHitters(), "tickers": HeavyHitters(), "platforms": HeavyHitters(), "timeframes": HeavyHitters()}
+	prerenderedTickers = int(os.environ.get("PRERENDER_TOP", 10))
+	prerenderedTimeframes = ["1H", "4H"]
+	prerenderBudget = 60
+	prerenderStatistics = {"runs": 0, "rendered": 0, "skipped": 0, "hits": 0}
+	prerenderedCharts = set()
+	isPrerendering = False
 	usedPresetsCache = {}
 	maliciousUsers = {}
+	requestSliceConcurrency = 3
 
 	discordSettingsLink = None
 	accountsLink = None
@@ -66,45 +103,89 @@ class Alpha(discord.AutoShardedClient):
 	discordMessagesLink = None
 	dataserverParserIndexLink = None
 
+	startup = None
+	parserIndexSnapshot = ParserIndexSnapshot(os.environ.get("PARSER_INDEX_SNAPSHOT", "/var/cache/alpha/parserIndex.bin"))
+	parserIndexExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+	parserIndexLock = threading.Lock()
+	pendingParserIndex = None
+	isParserIndexUpdateScheduled = False
+	isParserIndexFresh = False
+	parserIndexVersion = None
+
 
 	# -------------------------
 	# Startup
 	# -------------------------
 
 	def prepare(self):
-		"""Prepares all required objects and fetches Alpha settings
+		"""Prepares all required objects and starts fetching Alpha settings, statistics and parser index in parallel
 
 		"""
 
-		t = datetime.datetime.now().astimezone(pytz.utc)
-
 		atexit.register(self.cleanup)
+		self.snapshots.bind(self.loop)
 		Processor.clientId = "discord_alpha"
 		self.executor = concurrent.futures.ThreadPoolExecutor()
 		self.topgg = topgg.DBLClient(client, os.environ["TOPGG_KEY"])
 		self.logging = error_reporting.Client()
+		if os.environ["PRODUCTION_MODE"]:
+			self.accountWriter.onError = self.logging.report_exception
+			self.snapshots.onError = self.logging.report_exception
+		self.accountSubscriptions.subscribe = self.subscribe_accounts
+		self.accountSubscriptions.unsubscribe = self.unsubscribe_accounts
+		self.accountSubscriptions.onEvict = self.evict_account
 		TickerParser.set_parser_cached()
 
+		self.startup = StartupPhases(self.executor)
+		self.startup.start("database links", self.create_database_links)
+		self.startup.start("statistics", self.load_statistics, required=True)
+		if self.isLoadingAccountsOnDemand: self.startup.start("account index", self.load_account_index, required=True)
+		self.startup.start("parser index", self.load_parser_index, required=True)
+
+	def create_database_links(self):
+		"""Registers all Firestore snapshot listeners
+
+		"""
+
 		self.discordSettingsLink = database.document("discord/settings").on_snapshot(self.update_alpha_settings)
-		self.accountsLink = database.collection("accounts").where("oauth.discord.tokenType", "==", "Bearer").on_snapshot(self.update_account_properties)
+		if not self.isLoadingAccountsOnDemand: self.accountsLink = database.collection("accounts").where("oauth.discord.tokenType", "==", "Bearer").on_snapshot(self.update_account_properties)
 		self.discordPropertiesGuildsLink = database.collection("discord/properties/guilds").on_snapshot(self.update_guild_properties)
 		self.discordMessagesLink = database.collection("discord/properties/messages").on_snapshot(self.send_pending_messages)
 		self.dataserverParserIndexLink = database.document("dataserver/parserIndex").on_snapshot(self.update_parser_index_cache)
 
+	def load_parser_index(self):
+		"""Restores the parser index from the local snapshot and refreshes it in the background, or refreshes it right away if there's no usable snapshot
+
+		"""
+
+		if self.load_parser_index_snapshot(): self.startup.start("parser index refresh", TickerParser.refresh_parser_index, True)
+		else: TickerParser.refresh_parser_index(True)
+
+	def load_statistics(self):
+		"""Loads request statistics for the current month
+
+		"""
+
+		t = datetime.datetime.now().astimezone(pytz.utc)
 		statisticsData = database.document("discord/statistics").get().to_dict()
 		slice = "{}-{:02d}".format(t.year, t.month)
-		for data in statisticsData[slice]:
+		for data in statisticsData.get(slice, {}):
 			self.statistics[data] = statisticsData[slice][data]
-		print("[Startup]: database link activated")
-
-		TickerParser.refresh_parser_index(ccxt=True)
-		print("[Startup]: parser initialization complete")
 
 	async def on_ready(self):
 		"""Initiates all Discord dependent functions and flags the bot as ready to process requests
 
 		"""
 
+		if self.startup is not None:
+			for phase in self.startup.required:
+				try:
+					await self.startup.wait(phase)
+				except Exception:
+					print(traceback.format_exc())
+					if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+			print("[Startup]: startup phases: {}".format(self.startup.summary()))
+
 		t = datetime.datetime.now().astimezone(pytz.utc)
 
 		self.isBotReady = True
@@ -170,6 +251,7 @@ class Alpha(discord.AutoShardedClient):
 		"""
 
 		try:
+			self.accountWriter.flush()
 			if os.environ["PRODUCTION_MODE"] and self.statistics["c"] > 1000000:
 				statisticsRef = database.document("discord/statistics")
 				t = datetime.datetime.now().astimezone(pytz.utc)
@@ -193,7 +275,7 @@ class Alpha(discord.AutoShardedClient):
 		"""
 
 		try:
-			database.document("discord/properties/guilds/{}".format(guild.id)).set(MessageRequest.create_guild_settings({}))
+			await asyncDatabase.set("discord/properties/guilds/{}".format(guild.id), MessageRequest.create_guild_settings({}))
 			await self.update_guild_count()
 			if guild.id in constants.bannedGuilds:
 				await guild.leave()
@@ -215,11 +297,12 @@ class Alpha(discord.AutoShardedClient):
 			if guild.id in self.guildProperties and self.guildProperties[guild.id]["settings"]["setup"]["connection"] is not None:
 				holdingId = self.guildProperties[guild.id]["settings"]["setup"]["connection"]
 				if self.account_id_for(holdingId) is not None:
-					communityList = self.accountProperties[self.account_id_for(holdingId)]["customer"]["communitySubscriptions"]
-					if self.account_id_for(holdingId) is not None and str(guild.id) in communityList:
+					await self.load_account(self.account_id_for(holdingId))
+					communityList = self.accountProperties[self.account_id_for(holdingId)]["customer"]["communitySubscriptions"] if self.account_id_for(holdingId) in self.accountProperties else []
+					if str(guild.id) in communityList:
 						communityList.remove(str(guild.id))
-						database.document("accounts/{}".format(holdingId)).set({"customer": {"communitySubscriptions": communityList}}, merge=True)
-			database.document("discord/properties/guilds/{}".format(guild.id)).delete()
+						self.accountWriter.merge(holdingId, {"customer": {"communitySubscriptions": communityList}})
+			await asyncDatabase.delete("discord/properties/guilds/{}".format(guild.id))
 		except Exception:
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
@@ -254,8 +337,11 @@ class Alpha(discord.AutoShardedClient):
 					await client.loop.run_in_executor(self.executor, self.update_satellite_bot_counts)
 					await self.update_online_member_count()
 					await self.update_system_status(t)
+					print("[Metrics]: {}".format(json.dumps(self.collect_metrics(), sort_keys=True)))
 				if "1H" in timeframes:
 					await self.security_check()
+					for sketch in self.heavyHitters.values(): sketch.decay()
+					asyncio.ensure_future(self.prerender_charts([timeframe for timeframe in self.prerenderedTimeframes if timeframe in timeframes]))
 				if "1D" in timeframes:
 					await client.loop.run_in_executor(self.executor, TickerParser.refresh_parser_index, True)
 			except asyncio.CancelledError: return
@@ -263,13 +349,57 @@ class Alpha(discord.AutoShardedClient):
 				print(traceback.format_exc())
 				if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
 
+	async def prerender_charts(self, timeframes):
+		"""Warms the chart cache with the most requested tickers right after a candle closed
+
+		Charts are rendered one at a time with default settings, so the first request for a popular ticker after a
+		candle close is served from the chart cache. Pre-rendering stops once `prerenderBudget` seconds passed or
+		as soon as live requests keep the data server busy. The first cache hit of every
+		pre-rendered chart is counted, so the statistics show whether user requests actually match them.
+
+		Parameters
+		----------
+		timeframes : [str]
+			timeframes whose candle just closed
+		"""
+
+		if self.isPrerendering or self.prerenderedTickers <= 0 or len(timeframes) == 0: return
+		self.isPrerendering = True
+		try:
+			deadline = time.monotonic() + self.prerenderBudget
+			rawData = await asyncDatabase.get("dataserver/statistics")
+			tickers = []
+			for token in sorted([token for ranking in rawData["top"].values() for token in ranking], key=lambda token: token["rank"], reverse=True):
+				if token["id"] not in tickers: tickers.append(token["id"])
+			tickers = tickers[:self.prerenderedTickers]
+			messageRequest = MessageRequest(raw="", content="", authorId=client.user.id, guildId=-1, accountProperties={}, guildProperties={})
+
+			self.prerenderStatistics["runs"] += 1
+			self.prerenderedCharts = set()
+			charts = [(tickerId, timeframe) for tickerId in tickers for timeframe in timeframes]
+			for i, (tickerId, timeframe) in enumerate(charts):
+				if time.monotonic() > deadline or self.dataServerDeadlines.is_busy():
+					self.prerenderStatistics["skipped"] += len(charts) - i
+					break
+				outputMessage, request = Processor.process_chart_arguments(messageRequest, [timeframe.lower()], tickerId=tickerId.upper(), platform=None)
+				if outputMessage is not None: continue
+				for response in self.fetch_timeframes(messageRequest, "chart", request, isPrerendered=True):
+					payload, _ = await response
+					if payload is not None: self.prerenderStatistics["rendered"] += 1
+		except asyncio.CancelledError: pass
+		except Exception:
+			print(traceback.format_exc())
+			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+		finally:
+			self.isPrerendering = False
+
 
 	# -------------------------
 	# User management
 	# -------------------------
 
 	def update_alpha_settings(self, settings, changes, timestamp):
-		"""Updates Alpha settings when server side snapshot updates
+		"""Queues updated Alpha settings to be applied on the event loop
 
 		Parameters
 		----------
@@ -281,10 +411,13 @@ class Alpha(discord.AutoShardedClient):
 			timestamp indicating time of change in the database
 		"""
 
-		self.alphaSettings = settings[0].to_dict()
+		self.snapshots.put(("settings", "discord"), self.apply_alpha_settings, settings[0].to_dict())
+
+	def apply_alpha_settings(self, settings):
+		self.alphaSettings = settings
 
-	def update_account_properties(self, settings, changes, timestamp):
-		"""Updates Alpha Account properties
+	def update_account_properties(self, settings, changes, timestamp, accountIds=None):
+		"""Queues Alpha Account property changes to be applied on the event loop
 
 		Parameters
 		----------
@@ -294,28 +427,43 @@ class Alpha(discord.AutoShardedClient):
 			database changes in the sent snapshot
 		timestamp : int
 			timestamp indicating time of change in the database
+		accountIds : [str]
+			ids of the accounts the listener was opened for when accounts are loaded on demand
 		"""
 
 		try:
 			for change in changes:
-				properties = change.document.to_dict()
-				accountId = change.document.id
-				if change.type.name in ["ADDED", "MODIFIED"]:
-					userId = int(properties["oauth"]["discord"]["userId"])
-					self.accountProperties[userId] = properties
-					self.accountIdMap[userId] = accountId
-					self.accountIdMap[accountId] = userId
-				else:
-					userId = self.account_id_for(accountId)
-					self.accountProperties.pop(userId, None)
-					self.accountIdMap.pop(userId, None)
-					self.accountIdMap.pop(accountId, None)
+				record = AccountRecord(change.document.id, change.document.to_dict()) if change.type.name in ["ADDED", "MODIFIED"] else None
+				self.snapshots.put(("account", change.document.id), self.apply_account_change, change.document.id, record)
+			for accountId in ([] if accountIds is None else accountIds):
+				self.snapshots.put(("account", accountId), self.accountSubscriptions.loaded, accountId)
 		except Exception:
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
 
+	def apply_account_change(self, accountId, record):
+		if self.isLoadingAccountsOnDemand and not self.accountSubscriptions.is_subscribed(accountId): return
+		if record is not None:
+			pendingChanges = self.accountWriter.changes_for(accountId)
+			if pendingChanges is not None: merge_changes(record, pendingChanges)
+			userId = int(record["oauth"]["discord"]["userId"])
+			previousUserId = self.accountIdMap.get(accountId)
+			if previousUserId is not None and previousUserId != userId:
+				if previousUserId in self.accountProperties: AccountRecord.cache.discard(self.accountProperties.pop(previousUserId))
+				self.accountIdMap.pop(previousUserId, None)
+			if userId in self.accountProperties: AccountRecord.cache.discard(self.accountProperties[userId])
+			self.accountProperties[userId] = record
+			self.accountIdMap[userId] = accountId
+			self.accountIdMap[accountId] = userId
+		else:
+			userId = self.account_id_for(accountId)
+			if userId in self.accountProperties: AccountRecord.cache.discard(self.accountProperties[userId])
+			self.accountProperties.pop(userId, None)
+			self.accountIdMap.pop(userId, None)
+			self.accountIdMap.pop(accountId, None)
+
 	def update_guild_properties(self, settings, changes, timestamp):
-		"""Updates Discord guild properties
+		"""Queues Discord guild property changes to be applied on the event loop
 
 		Parameters
 		----------
@@ -330,14 +478,17 @@ class Alpha(discord.AutoShardedClient):
 		try:
 			for change in changes:
 				guildId = int(change.document.id)
-				if change.type.name in ["ADDED", "MODIFIED"]:
-					self.guildProperties[guildId] = change.document.to_dict()
-				else:
-					self.guildProperties.pop(guildId)			
+				self.snapshots.put(("guild", guildId), self.apply_guild_change, change.type.name, guildId, change.document.to_dict())
 		except Exception:
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
 
+	def apply_guild_change(self, changeType, guildId, properties):
+		if changeType in ["ADDED", "MODIFIED"]:
+			self.guildProperties[guildId] = properties
+		else:
+			self.guildProperties.pop(guildId, None)
+
 	def send_pending_messages(self, pendingMessages, changes, timestamp):
 		"""Sends all pending messages to dedicated channels
 
@@ -399,6 +550,119 @@ class Alpha(discord.AutoShardedClient):
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
 
+	def load_account_index(self):
+		"""Loads the Discord user id and account id pairs of all connected accounts without their properties
+
+		The index is loaded once on startup, accounts connected later are looked up when their users first make a
+		request.
+		"""
+
+		index = {}
+		for document in database.collection("accounts").where("oauth.discord.tokenType", "==", "Bearer").select(["oauth.discord.userId"]).stream():
+			userId = int(document.get("oauth.discord.userId"))
+			index[userId] = document.id
+			index[document.id] = userId
+		self.snapshots.put(("index", "accounts"), self.apply_account_index, index)
+
+	def apply_account_index(self, index):
+		self.accountIdMap.update(index)
+
+	def look_up_account(self, userId):
+		"""Finds the id of the account connected to a Discord user missing in the account index, or None
+
+		Blocks on the database request, coroutines run it on the database executor.
+
+		Parameters
+		----------
+		userId : int
+			Discord user id
+		"""
+
+		for document in database.collection("accounts").where("oauth.discord.userId", "==", str(userId)).select(["oauth.discord.tokenType"]).limit(1).stream():
+			if document.get("oauth.discord.tokenType") == "Bearer": return document.id
+		return None
+
+	async def subscribe_accounts(self, accountIds):
+		"""Opens a single listener on a group of account documents
+
+		Parameters
+		----------
+		accountIds : [str]
+			ids of the account documents
+		"""
+
+		references = [database.client.document("accounts/{}".format(accountId)) for accountId in accountIds]
+		query = database.client.collection("accounts").where("__name__", "in", references)
+		return await asyncDatabase.run(query.on_snapshot, lambda settings, changes, timestamp: self.update_account_properties(settings, changes, timestamp, accountIds))
+
+	def unsubscribe_accounts(self, watch):
+		asyncio.ensure_future(asyncDatabase.run(watch.unsubscribe))
+
+	def evict_account(self, accountId):
+		userId = self.account_id_for(accountId)
+		if userId in self.accountProperties: AccountRecord.cache.discard(self.accountProperties.pop(userId))
+
+	async def load_account(self, userId):
+		"""Makes sure properties of a connected account are in memory when accounts are loaded on demand
+
+		Users missing in the account index are looked up in the database. Users without a connected account aren't
+		looked up again for `ACCOUNT_LOOKUP_TTL` seconds.
+
+		Parameters
+		----------
+		userId : int
+			Discord user id
+		"""
+
+		if not self.isLoadingAccountsOnDemand: return
+		accountId = self.account_id_for(userId)
+		if accountId is None:
+			if self.unknownAccounts.get(userId) is not None: return
+			accountId = await asyncDatabase.run(self.look_up_account, userId)
+			if accountId is None:
+				self.unknownAccounts.store(userId, True)
+				return
+			self.accountIdMap[userId] = accountId
+			self.accountIdMap[accountId] = userId
+		await self.accountSubscriptions.load(accountId)
+
+	def account_properties_for(self, userId):
+		"""Returns account properties of a connected user, fetching them from the database if they aren't in memory
+
+		Blocks on the database request when accounts are loaded on demand, only call it outside of the event loop.
+		Changes which weren't written yet are applied to fetched properties. Returns None for unknown accounts.
+
+		Parameters
+		----------
+		userId : int
+			Discord user id
+		"""
+
+		if userId in self.accountProperties or not self.isLoadingAccountsOnDemand: return self.accountProperties.get(userId)
+		accountId = self.account_id_for(userId)
+		if accountId is None: return None
+		properties = database.document("accounts/{}".format(accountId)).get().to_dict()
+		if properties is None: return None
+		pendingChanges = self.accountWriter.changes_for(accountId)
+		if pendingChanges is not None: merge_changes(properties, pendingChanges)
+		return AccountRecord(accountId, properties)
+
+	def report_usage(self, subscriptionId, quantity):
+		"""Records metered usage of an Alpha Pro add-on on a Stripe subscription
+
+		Blocks on Stripe API requests, coroutines run it in the executor.
+
+		Parameters
+		----------
+		subscriptionId : str
+			Stripe subscription id
+		quantity : int
+			used quantity
+		"""
+
+		subscription = stripe.Subscription.retrieve(subscriptionId)
+		stripe.SubscriptionItem.create_usage_record(subscription["items"]["data"][0]["id"], quantity=quantity, timestamp=int(time.time()))
+
 	def account_id_for(self, id):
 		"""Finds an account id for a passed Discord user Id
 
@@ -411,7 +675,7 @@ class Alpha(discord.AutoShardedClient):
 		return self.accountIdMap.get(id, None)
 
 	def update_parser_index_cache(self, updatedCache, changes, timestamp):
-		"""Updates parser index cache
+		"""Queues parser index snapshot for processing on the parser index worker
 
 		Parameters
 		----------
@@ -424,23 +688,128 @@ class Alpha(discord.AutoShardedClient):
 		"""
 
 		try:
-			updatedCache = updatedCache[0].to_dict()
-			if TickerParser.isCcxtCached:
-				TickerParser.ccxtIndex = pickle.loads(zlib.decompress(updatedCache["CCXT"]))
-				completedTasks = set()
-				for platform in supported.cryptoExchanges:
-					for exchange in supported.cryptoExchanges[platform]:
-						if exchange not in completedTasks:
-							if exchange not in TickerParser.exchanges: TickerParser.exchanges[exchange] = Exchange(exchange)
-							completedTasks.add(exchange)
-			if TickerParser.isCoinGeckoCached:
-				TickerParser.coinGeckoIndex = pickle.loads(zlib.decompress(updatedCache["CoinGecko"]))
-			if TickerParser.isIexcCached:
-				TickerParser.iexcStocksIndex = pickle.loads(zlib.decompress(updatedCache["IEXC Stocks"]))
-				TickerParser.iexcForexIndex = pickle.loads(zlib.decompress(updatedCache["IEXC Forex"]))
-				for _, stock in TickerParser.iexcStocksIndex.items():
-					if stock["exchange"] not in TickerParser.exchanges:
-						TickerParser.exchanges[stock["exchange"]] = Exchange(stock["exchange"])
+			with self.parserIndexLock:
+				self.pendingParserIndex = updatedCache[0].to_dict()
+				if self.isParserIndexUpdateScheduled: return
+				self.isParserIndexUpdateScheduled = True
+			self.parserIndexExecutor.submit(self.process_parser_index_updates)
+		except Exception:
+			print(traceback.format_exc())
+			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+
+	def process_parser_index_updates(self):
+		"""Builds and publishes parser indexes from queued snapshots
+
+		Only the latest queued snapshot is processed, intermediate snapshots that arrived while an index was being
+		built are skipped.
+		"""
+
+		while True:
+			with self.parserIndexLock:
+				document = self.pendingParserIndex
+				self.pendingParserIndex = None
+				if document is None:
+					self.isParserIndexUpdateScheduled = False
+					return
+
+			try:
+				index = self.build_parser_index(document)
+				self.publish_parser_index(index, isFresh=True)
+				self.save_parser_index_snapshot({name: document[name] for name in ParserIndexSnapshot.sections if name in document})
+			except Exception:
+				print(traceback.format_exc())
+				if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+
+	def build_parser_index(self, document):
+		"""Decodes parser index blobs into new index objects without touching the published index
+
+		When the document carries deltas against the currently published index version, only changed entries are
+		decoded and applied on top of a copy of the current index. Otherwise all sections are decoded in full.
+
+		Parameters
+		----------
+		document : dict
+			parser index document with compressed CCXT, CoinGecko and IEXC indexes, and optionally `version` and
+			`deltas` fields (`baseVersion` and compressed `{"update": {...}, "remove": [...]}` changes per section)
+		"""
+
+		deltas = document.get("deltas")
+		isIncremental = deltas is not None and self.parserIndexVersion is not None and deltas.get("baseVersion") == self.parserIndexVersion
+
+		def decode_section(name, current):
+			if isIncremental:
+				if name not in deltas: return current
+				changes = ParserIndexCodec.decode(deltas[name])
+				section = dict(current)
+				section.update(changes.get("update", {}))
+				for key in changes.get("remove", []): section.pop(key, None)
+				return section
+			return ParserIndexCodec.decode(document[name])
+
+		index = {"version": document.get("version"), "exchanges": TickerParser.exchanges}
+		newExchanges = set()
+		if TickerParser.isCcxtCached:
+			index["ccxtIndex"] = decode_section("CCXT", TickerParser.ccxtIndex)
+			for platform in supported.cryptoExchanges:
+				for exchange in supported.cryptoExchanges[platform]:
+					if exchange not in TickerParser.exchanges: newExchanges.add(exchange)
+		if TickerParser.isCoinGeckoCached:
+			index["coinGeckoIndex"] = decode_section("CoinGecko", TickerParser.coinGeckoIndex)
+		if TickerParser.isIexcCached:
+			index["iexcStocksIndex"] = decode_section("IEXC Stocks", TickerParser.iexcStocksIndex)
+			index["iexcForexIndex"] = decode_section("IEXC Forex", TickerParser.iexcForexIndex)
+			for _, stock in index["iexcStocksIndex"].items():
+				if stock["exchange"] not in TickerParser.exchanges: newExchanges.add(stock["exchange"])
+
+		if len(newExchanges) != 0:
+			index["exchanges"] = dict(TickerParser.exchanges)
+			for exchange in newExchanges:
+				index["exchanges"][exchange] = Exchange(exchange)
+
+		return index
+
+	def publish_parser_index(self, index, isFresh):
+		"""Publishes a fully built parser index by swapping index references
+
+		Parameters
+		----------
+		index : dict
+			index objects returned by build_parser_index
+		isFresh : bool
+			whether the index comes from the database, stale indexes never replace a fresh one
+		"""
+
+		with self.parserIndexLock:
+			if not isFresh and self.isParserIndexFresh: return False
+			TickerParser.exchanges = index["exchanges"]
+			if "ccxtIndex" in index: TickerParser.ccxtIndex = index["ccxtIndex"]
+			if "coinGeckoIndex" in index: TickerParser.coinGeckoIndex = index["coinGeckoIndex"]
+			if "iexcStocksIndex" in index: TickerParser.iexcStocksIndex = index["iexcStocksIndex"]
+			if "iexcForexIndex" in index: TickerParser.iexcForexIndex = index["iexcForexIndex"]
+			self.parserIndexVersion = index["version"]
+			if isFresh: self.isParserIndexFresh = True
+		self.unavailableResponses.clear()
+		return True
+
+	def load_parser_index_snapshot(self):
+		"""Serves ticker lookups from the last parser index stored on local disk until a fresh one arrives
+
+		"""
+
+		try:
+			blobs, timestamp = self.parserIndexSnapshot.load()
+			if blobs is None: return False
+			if not self.publish_parser_index(self.build_parser_index(blobs), isFresh=False): return True
+			print("[Startup]: parser index restored from local snapshot created on {}".format(Utils.timestamp_to_date(timestamp)))
+			return True
+		except Exception:
+			print(traceback.format_exc())
+			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+			return False
+
+	def save_parser_index_snapshot(self, blobs):
+		try:
+			self.parserIndexSnapshot.save(blobs)
 		except Exception:
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
@@ -539,7 +908,7 @@ class Alpha(discord.AutoShardedClient):
 				await suspiciousUserNamesMessage.edit(content=suspiciousUserNamesTest[:2000])
 				await suspiciousUserNicknamesMessage.edit(content=suspiciousUserNicknamesText[:2000])
 
-				database.document("discord/settings").set({"tosWatchlist": self.alphaSettings["tosWatchlist"]}, merge=True)
+				await asyncDatabase.set("discord/settings", {"tosWatchlist": self.alphaSettings["tosWatchlist"]}, merge=True)
 		except asyncio.CancelledError: pass
 		except Exception:
 			print(traceback.format_exc())
@@ -556,11 +925,12 @@ class Alpha(discord.AutoShardedClient):
 				if guildId not in guildIds:
 					if self.guildProperties[guildId]["settings"]["setup"]["connection"] is not None:
 						holdingId = self.guildProperties[guildId]["settings"]["setup"]["connection"]
-						if self.account_id_for(holdingId) is not None:
-							communityList = self.accountProperties[self.account_id_for(holdingId)]["customer"]["communitySubscriptions"]
-							if self.account_id_for(holdingId) is not None and str(guildId) in communityList:
+						accountProperties = self.account_properties_for(self.account_id_for(holdingId))
+						if accountProperties is not None:
+							communityList = accountProperties["customer"]["communitySubscriptions"]
+							if str(guildId) in communityList:
 								communityList.remove(str(guildId))
-								database.document("accounts/{}".format(holdingId)).set({"customer": {"communitySubscriptions": communityList}}, merge=True)
+								self.accountWriter.merge(holdingId, {"customer": {"communitySubscriptions": communityList}})
 					database.document("discord/properties/guilds/{}".format(guildId)).delete()
 		except Exception:
 			print(traceback.format_exc())
@@ -584,7 +954,8 @@ class Alpha(discord.AutoShardedClient):
 			
 			for accountId in affectedAccountIds:
 				guildMap, satelliteCount = [e[0] for e in countMap[accountId]], sum([e[1] for e in countMap[accountId]])
-				accountProperties = self.accountProperties[self.account_id_for(accountId)]
+				accountProperties = self.account_properties_for(self.account_id_for(accountId))
+				if accountProperties is None: continue
 				
 				if accountProperties["customer"]["personalSubscription"].get("subscription", None) is None:
 					satelliteCount = 0
@@ -596,14 +967,13 @@ class Alpha(discord.AutoShardedClient):
 								print("[Development]: Satellites disabled for server {} held by {}".format(guildId, accountId))
 				elif accountProperties["customer"]["addons"].get("satellites", 0) < satelliteCount:
 					if os.environ["PRODUCTION_MODE"]:
-						subscription = stripe.Subscription.retrieve(accountProperties["customer"]["personalSubscription"]["subscription"])
-						stripe.SubscriptionItem.create_usage_record(subscription["items"]["data"][0]["id"], quantity=(satelliteCount - accountProperties["customer"]["addons"].get("satellites", 0)) * 20, timestamp=int(time.time()))
+						self.report_usage(accountProperties["customer"]["personalSubscription"]["subscription"], (satelliteCount - accountProperties["customer"]["addons"].get("satellites", 0)) * 20)
 					else:
 						print("[Development]: Charging server {} held by {} for {} new satellites".format(guildId, accountId, satelliteCount - accountProperties["customer"]["addons"].get("satellites", 0)))
 
 				if accountProperties["customer"]["addons"].get("satellites", 0) < satelliteCount:
 					if os.environ["PRODUCTION_MODE"]:
-						database.document("accounts/{}".format(accountId)).set({"customer": {"addons": {"satellites": satelliteCount}}}, merge=True)
+						self.accountWriter.merge(accountId, {"customer": {"addons": {"satellites": satelliteCount}}})
 					else:
 						print("[Development]: Satellites count set to {} for server {} held by {}".format(satelliteCount, guildId, accountId))
 		except Exception:
@@ -637,21 +1007,21 @@ class Alpha(discord.AutoShardedClient):
 			for accountId in affectedAccountIds:
 				guildMap, onlineCount = [e[0] for e in countMap[accountId]], sum([e[1] for e in countMap[accountId]])
 				estimatedCount = 0
-				accountProperties = self.accountProperties[self.account_id_for(accountId)]
+				accountProperties = await client.loop.run_in_executor(self.executor, self.account_properties_for, self.account_id_for(accountId))
+				if accountProperties is None: continue
 				
 				if accountProperties["customer"]["personalSubscription"].get("subscription", None) is None:
 					onlineCount = 0
 					for guildId in guildMap:
 						if self.guildProperties[guildId]["addons"]["noads"]["enabled"]:
 							if os.environ["PRODUCTION_MODE"]:
-								database.document("discord/properties/guilds/{}".format(guildId)).set({"addons": {"noads": {"enabled": False}}}, merge=True)
+								await asyncDatabase.set("discord/properties/guilds/{}".format(guildId), {"addons": {"noads": {"enabled": False}}}, merge=True)
 							else:
 								print("[Development]: No ads option disabled for server {} held by {}".format(guildId, accountId))
 				elif accountProperties["customer"]["addons"].get("noads", 0) == 0 and onlineCount != 0:
 					estimatedCount = onlineCount
 					if os.environ["PRODUCTION_MODE"]:
-						subscription = stripe.Subscription.retrieve(accountProperties["customer"]["personalSubscription"]["subscription"])
-						stripe.SubscriptionItem.create_usage_record(subscription["items"]["data"][0]["id"], quantity=int(math.log2(estimatedCount) * 10), timestamp=int(time.time()))
+						await client.loop.run_in_executor(self.executor, self.report_usage, accountProperties["customer"]["personalSubscription"]["subscription"], int(math.log2(estimatedCount) * 10))
 					else:
 						print("[Development]: Charging account {} for {} users".format(accountId, estimatedCount))
 				elif onlineCount != 0:
@@ -659,13 +1029,20 @@ class Alpha(discord.AutoShardedClient):
 
 				if estimatedCount != accountProperties["customer"]["addons"].get("noads", 0):
 					if os.environ["PRODUCTION_MODE"]:
-						database.document("accounts/{}".format(accountId)).set({"customer": {"addons": {"noads": estimatedCount}}}, merge=True)
+						self.accountWriter.merge(accountId, {"customer": {"addons": {"noads": estimatedCount}}})
 					else:
 						print("[Development]: Estimated user count set to {} for account {}".format(estimatedCount, accountId))
 		except Exception:
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
 
+	def is_discord_operational(self):
+		"""Checks Discord's status page, blocks until it responds"""
+
+		req = urllib.request.Request("https://status.discordapp.com", headers={"User-Agent": "Mozilla/5.0"})
+		webpage = str(urllib.request.urlopen(req, timeout=10).read())
+		return "All Systems Operational" in webpage
+
 	async def update_system_status(self, t):
 		"""Updates system status messages in Alpha community guild
 
@@ -676,8 +1053,7 @@ class Alpha(discord.AutoShardedClient):
 		"""
 
 		try:
-			statisticsRef = database.document("discord/statistics")
-			statisticsRef.set({"{}-{:02d}".format(t.year, t.month): self.statistics}, merge=True)
+			await asyncDatabase.set("discord/statistics", {"{}-{:02d}".format(t.year, t.month): self.statistics}, merge=True)
 
 			numOfCharts = ":chart_with_upwards_trend: {:,} charts requested".format(self.statistics["c"] + self.statistics["hmap"])
 			numOfAlerts = ":bell: {:,} alerts set".format(self.statistics["alerts"])
@@ -686,9 +1062,7 @@ class Alpha(discord.AutoShardedClient):
 			numOfQuestions = ":crystal_ball: {:,} questions asked".format(self.statistics["alpha"])
 			numOfGuilds = ":heart: Used in {:,} Discord communities".format(len(client.guilds))
 
-			req = urllib.request.Request("https://status.discordapp.com", headers={"User-Agent": "Mozilla/5.0"})
-			webpage = str(urllib.request.urlopen(req).read())
-			isAlphaOnline = "All Systems Operational" in webpage
+			isAlphaOnline = await client.loop.run_in_executor(self.executor, self.is_discord_operational)
 
 			statisticsEmbed = discord.Embed(title="{}\n{}\n{}\n{}\n{}\n{}".format(numOfCharts, numOfAlerts, numOfPrices, numOfTrades, numOfQuestions, numOfGuilds), color=constants.colors["deep purple"])
 			statusEmbed = discord.Embed(title="{} Alpha Bot: {}".format(":white_check_mark:" if isAlphaOnline else ":warning:", "all systems operational" if isAlphaOnline else "degraded performance"), color=constants.colors["deep purple" if isAlphaOnline else "gray"])
@@ -712,19 +1086,26 @@ class Alpha(discord.AutoShardedClient):
 	# -------------------------
 
 	async def on_message(self, message):
+		accountRecord = None
 		try:
+			if len(self.confirmations.pending) != 0 and self.confirmations.resolve(message.author.id, message.channel.id, message.clean_content): return
+			if not self.is_potential_request(message): return
+
 			_rawMessage = " ".join(message.clean_content.split())
 			_messageContent = _rawMessage.lower()
 			_authorId = message.author.id if message.webhook_id is None else message.webhook_id
 			_guildId = message.guild.id if message.guild is not None else -1
 			if _authorId == 361916376069439490 and " --user " in _messageContent: _messageContent, _authorId = _messageContent.split(" --user ")[0], int(_messageContent.split(" --user ")[1])
 			if _authorId == 361916376069439490 and " --guild " in _messageContent: _messageContent, _guildId = _messageContent.split(" --guild ")[0], int(_messageContent.split(" --guild ")[1])
+			await self.load_account(_authorId)
+			accountRecord = self.accountProperties.get(_authorId)
+			if accountRecord is not None: accountRecord.pin()
 			messageRequest = MessageRequest(
 				raw=_rawMessage,
 				content=_messageContent,
 				authorId=_authorId,
 				guildId=_guildId,
-				accountProperties=({} if _authorId not in self.accountProperties else self.accountProperties[_authorId]),
+				accountProperties=({} if accountRecord is None else accountRecord),
 				guildProperties=({} if _guildId not in self.guildProperties else self.guildProperties[_guildId])
 			)
 			sentMessages = []
@@ -733,9 +1114,8 @@ class Alpha(discord.AutoShardedClient):
 			isUserBlocked = (messageRequest.authorId in constants.blockedBots if message.webhook_id is None else any(e in message.author.name.lower() for e in constants.blockedBotNames)) if message.author.bot else messageRequest.authorId in constants.blockedUsers
 			isChannelBlocked = message.channel.id in constants.blockedChannels or messageRequest.guildId in constants.blockedGuilds
 			hasContent = messageRequest.raw != "" and message.type == discord.MessageType.default
-			isUserLocked = messageRequest.authorId in self.lockedUsers
 
-			if not self.isBotReady or isSelf or isUserBlocked or isChannelBlocked or not hasContent or isUserLocked: return
+			if not self.isBotReady or isSelf or isUserBlocked or isChannelBlocked or not hasContent: return
 
 			shortcutsEnabled = messageRequest.guildProperties["settings"]["messageProcessing"]["shortcuts"]
 			hasPermissions = True if messageRequest.guildId == -1 else (message.guild.me.permissions_in(message.channel).send_messages and message.guild.me.permissions_in(message.channel).embed_links and message.guild.me.permissions_in(message.channel).attach_files and message.guild.me.permissions_in(message.channel).add_reactions and message.guild.me.permissions_in(message.channel).manage_messages)
@@ -770,33 +1150,20 @@ class Alpha(discord.AutoShardedClient):
 							self.usedPresetsCache[messageRequest.guildId] = self.usedPresetsCache[messageRequest.guildId][-3:]
 
 						if messageRequest.accountProperties["customer"]["addons"].get("commandPresets", 0) == 0:
-							subscription = stripe.Subscription.retrieve(messageRequest.accountProperties["customer"]["personalSubscription"]["subscription"])
-							stripe.SubscriptionItem.create_usage_record(subscription["items"]["data"][0]["id"], quantity=10, timestamp=int(time.time()))
-							database.document("accounts/{}".format(self.account_id_for(messageRequest.authorId))).set({"customer": {"addons": {"commandPresets": 1}}}, merge=True)
+							await client.loop.run_in_executor(self.executor, self.report_usage, messageRequest.accountProperties["customer"]["personalSubscription"]["subscription"], 10)
+							self.accountWriter.merge(self.account_id_for(messageRequest.authorId), {"customer": {"addons": {"commandPresets": 1}}})
 
 						embed = discord.Embed(title="Running `{}` command from personal preset.".format(messageRequest.content), color=constants.colors["light blue"])
 						sentMessages.append(await message.channel.send(embed=embed))
 					elif len(parsedPresets) != 0:
 						embed = discord.Embed(title="Do you want to add `{}` preset to your account?".format(parsedPresets[0]["phrase"]), description="`{}` → `{}`".format(parsedPresets[0]["phrase"], parsedPresets[0]["shortcut"]), color=constants.colors["light blue"])
 						addPresetMessage = await message.channel.send(embed=embed)
-						self.lockedUsers.add(messageRequest.authorId)
-
-						def confirm_order(m):
-							if m.author.id == messageRequest.authorId:
-								response = ' '.join(m.clean_content.lower().split())
-								if response.startswith(("y", "yes", "sure", "confirm", "execute")): return True
-								elif response.startswith(("n", "no", "cancel", "discard", "reject")): raise Exception()
-
-						try:
-							this = await client.wait_for('message', timeout=60.0, check=confirm_order)
-						except:
-							self.lockedUsers.discard(messageRequest.authorId)
+						if not await self.confirmations.confirm(messageRequest.authorId, message.channel.id):
 							embed = discord.Embed(title="Canceled", description="~~Do you want to add `{}` preset to your account?~~".format(parsedPresets[0]["phrase"]), color=constants.colors["gray"])
 							try: await addPresetMessage.edit(embed=embed)
 							except: pass
 							return
 						else:
-							self.lockedUsers.discard(messageRequest.authorId)
 							messageRequest.content = "preset add {} {}".format(parsedPresets[0]["phrase"], parsedPresets[0]["shortcut"])
 
 			messageRequest.content, messageRequest.shortcutUsed, isDeprecated = Utils.shortcuts(messageRequest.content, shortcutsEnabled)
@@ -867,6 +1234,10 @@ class Alpha(discord.AutoShardedClient):
 						await message.delete()
 						settings = copy.deepcopy(messageRequest.guildProperties)
 						await message.author.send(content="```json\n{}\n```".format(json.dumps(settings, indent=3, sort_keys=True)))
+					elif command == "stats":
+						await message.channel.send(content="```json\n{}\n```".format(json.dumps(self.collect_metrics(), indent=3, sort_keys=True)))
+					elif command == "hot":
+						await message.channel.send(content="```json\n{}\n```".format(json.dumps({name: sketch.metrics(20) for name, sketch in self.heavyHitters.items()}, indent=3, sort_keys=True)))
 					elif command.startswith("del"):
 						if message.guild.me.guild_permissions.manage_messages:
 							parameters = messageRequest.content.split("del ", 1)
@@ -876,473 +1247,8 @@ class Alpha(discord.AutoShardedClient):
 						say = message.content.split("say ", 1)
 						await message.channel.send(say[1])
 			elif isCommand:
-				if messageRequest.content.startswith(("alpha ", "alpha, ", "@alpha ", "@alpha, ")):
-					self.statistics["alpha"] += 1
-					
-					if messageRequest.content == messageRequest.raw.lower():
-						rawCaps = messageRequest.raw.split(" ", 1)[1]
-					else:
-						rawCaps = messageRequest.content.split(" ", 1)[1]
-					
-					if len(rawCaps) > 500: return
-					if messageRequest.guildProperties["settings"]["assistant"]["enabled"]:
-						await message.channel.trigger_typing()
-					fallThrough, response = await self.assistant.process_reply(messageRequest.content, rawCaps, messageRequest.guildProperties["settings"]["assistant"]["enabled"])
-
-					if fallThrough:
-						if response == "help":
-							await self.help(message, messageRequest)
-						elif response == "ping":
-							await message.channel.send(content="Pong")
-						elif response == "pro":
-							await message.channel.send(content="Visit https://www.alphabotsystem.com/pro to learn more about Alpha Pro and how to start your free trial.")
-						elif response == "invite":
-							await message.channel.send(content="https://discord.com/oauth2/authorize?client_id=401328409499664394&scope=bot&permissions=604372032")
-						elif response == "vote":
-							await message.channel.send(content="https://top.gg/bot/401328409499664394/vote")
-						elif response == "referrals":
-							embed = discord.Embed(title="Alpha referral links", color=constants.colors["deep purple"])
-							embed.add_field(name="Binance", value="Get 10% kickback on all commissions when trading on Binance by [signing up here](https://www.binance.com/en/register?ref=PJF2KLMW)", inline=False)
-							embed.add_field(name="Bitmex", value="Get 10% fee discount for the first 6 months when trading on BitMEX by [signing up here](https://www.bitmex.com/register/Cz9JxF)", inline=False)
-							embed.add_field(name="TradingView", value="Get $30 after purchasing a paid plan on TradingView by [signing up here](https://www.tradingview.com/gopro/?share_your_love=AlphaBotSystem)", inline=False)
-							embed.add_field(name="FTX", value="Get a 5% fee discount on all your trades on FTX by [signing up here](https://ftx.com/#a=Alpha)", inline=False)
-							embed.add_field(name="Coinbase", value="Get $13 on Coinbase after [signing up here](https://www.coinbase.com/join/conrad_78)", inline=False)
-							embed.add_field(name="Deribit", value="Get 10% fee discount for the first 6 months when trading on Deribit by [signing up here](https://www.deribit.com/reg-8980.6502)", inline=False)
-							await message.channel.send(embed=embed)
-						elif response == "settings":
-							pass
-					elif response is not None and response != "":
-						await message.channel.send(content=response)
-				elif messageRequest.content.startswith("set "):
-					if message.author.bot: return
-					if messageRequest.guildId == -1: return
-
-					if messageRequest.content == "set help":
-						embed = discord.Embed(title=":control_knobs: Functionality Settings", description="Sign into [your Alpha Account](https://www.alphabotsystem.com/account) to access your personal and community Discord preferences.", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						embed = discord.Embed(title=":control_knobs: Functionality Settings", description="All personal and community preferences have been moved to our website. Sign into [your Alpha Account](https://www.alphabotsystem.com/account) to access them.", color=constants.colors["deep purple"])
-						await message.channel.send(embed=embed)
-				elif messageRequest.content.startswith("preset "):
-					if message.author.bot: return
-
-					if messageRequest.content == "preset help":
-						embed = discord.Embed(title=":pushpin: Command presets", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", preset | preset", messageRequest.content.split(" ", 1)[1])
-						if len(requestSlices) > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							await self.presets(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "preset")
-				elif messageRequest.content.startswith("c "):
-					if messageRequest.content == "c help":
-						embed = discord.Embed(title=":chart_with_upwards_trend: Charts", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", c | c |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 2
-							else: self.rateLimited[messageRequest.authorId] = 2
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								platform = None
-								if requestSlice.startswith("am "): platform, requestSlice = "Alternative.me", requestSlice[3:]
-								elif requestSlice.startswith("wc "): platform, requestSlice = "Woobull Charts", requestSlice[3:]
-								elif requestSlice.startswith("tl "): platform, requestSlice = "TradingLite", requestSlice[3:]
-								elif requestSlice.startswith("tv "): platform, requestSlice = "TradingView", requestSlice[3:]
-								elif requestSlice.startswith("bm "): platform, requestSlice = "Bookmap", requestSlice[3:]
-								elif requestSlice.startswith("gc "): platform, requestSlice = "GoCharting", requestSlice[3:]
-								elif requestSlice.startswith("fv "): platform, requestSlice = "Finviz", requestSlice[3:]
-
-								chartMessages, weight = await self.chart(message, messageRequest, requestSlice, platform)
-								sentMessages += chartMessages
-								totalWeight += weight - 1
-
-								if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += weight - 2
-								else: self.rateLimited[messageRequest.authorId] = weight - 2
-						await self.add_tip_message(message, messageRequest, "c")
-
-						self.statistics["c"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("flow "):
-					if messageRequest.content == "flow help":
-						embed = discord.Embed(title=":microscope: Alpha Flow", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", flow | flow |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 2
-							else: self.rateLimited[messageRequest.authorId] = 2
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								platform = None
-								if requestSlice.startswith("bb "): platform, requestSlice = "Bender ProfitBox", requestSlice[3:]
-
-								chartMessages, weight = await self.flow(message, messageRequest, requestSlice, platform)
-								sentMessages += chartMessages
-								totalWeight += weight - 1
-
-								if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += weight - 2
-								else: self.rateLimited[messageRequest.authorId] = weight - 2
-						await self.add_tip_message(message, messageRequest, "flow")
-
-						self.statistics["flow"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("hmap "):
-					if messageRequest.content == "hmap help":
-						embed = discord.Embed(title=":fire: Heat map", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", hmap | hmap |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 2
-							else: self.rateLimited[messageRequest.authorId] = 2
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								platform = None
-								if requestSlice.startswith("bg "): platform, requestSlice = "Bitgur", requestSlice[3:]
-								elif requestSlice.startswith("fv "): platform, requestSlice = "Finviz", requestSlice[3:]
-
-								chartMessages, weight = await self.heatmap(message, messageRequest, requestSlice, platform)
-
-								sentMessages += chartMessages
-								totalWeight += weight - 1
-
-								if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 2 - weight
-								else: self.rateLimited[messageRequest.authorId] = 2 - weight
-						await self.add_tip_message(message, messageRequest, "hmap")
-
-						self.statistics["hmap"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("d "):
-					if messageRequest.content == "d help":
-						embed = discord.Embed(title=":book: Orderbook visualizations", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", d | d |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 2
-							else: self.rateLimited[messageRequest.authorId] = 2
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								platform = None
-								if requestSlice.startswith("cx "): platform, requestSlice = "CCXT", requestSlice[3:]
-
-								chartMessages, weight = await self.depth(message, messageRequest, requestSlice, platform)
-								sentMessages += chartMessages
-								totalWeight += weight - 1
-
-								if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += weight - 2
-								else: self.rateLimited[messageRequest.authorId] = weight - 2
-						await self.add_tip_message(message, messageRequest, "d")
-
-						self.statistics["d"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith(("alert ", "alerts ")):
-					if message.author.bot: return
-
-					if messageRequest.content in ["alert help", "alerts help"]:
-						embed = discord.Embed(title=":bell: Price Alerts", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", alert | alert |, alerts | alerts |, ", messageRequest.content.split(" ", 1)[1])
-						if len(requestSlices) > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							await self.alert(message, messageRequest, requestSlice)
-							self.statistics["alerts"] += 1
-						await self.add_tip_message(message, messageRequest, "alerts")
-				elif messageRequest.content.startswith("p "):
-					if messageRequest.content == "p help":
-						embed = discord.Embed(title=":money_with_wings: Prices", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", p | p |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 2
-							else: self.rateLimited[messageRequest.authorId] = 2
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								platform = None
-								if requestSlice.startswith("am "): platform, requestSlice = "Alternative.me", requestSlice[3:]
-								elif requestSlice.startswith("cg "): platform, requestSlice = "CoinGecko", requestSlice[3:]
-								elif requestSlice.startswith("cm "): platform, requestSlice = "CCXT", requestSlice[3:]
-								elif requestSlice.startswith("tm "): platform, requestSlice = "IEXC", requestSlice[3:]
-
-								chartMessages, weight = await self.price(message, messageRequest, requestSlice, platform)
-								sentMessages += chartMessages
-								totalWeight += weight - 1
-
-								if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += weight - 2
-								else: self.rateLimited[messageRequest.authorId] = weight - 2
-						await self.add_tip_message(message, messageRequest, "p")
-
-						self.statistics["p"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("v "):
-					if messageRequest.content == ":credit_card: v help":
-						embed = discord.Embed(title="Volume", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", v | v |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 1
-							else: self.rateLimited[messageRequest.authorId] = 1
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								platform = None
-								if requestSlice.startswith("cg "): platform, requestSlice = "CoinGecko", requestSlice[3:]
-								elif requestSlice.startswith("cx "): platform, requestSlice = "CCXT", requestSlice[3:]
-
-								await self.volume(message, messageRequest, requestSlice, platform)
-						await self.add_tip_message(message, messageRequest, "v")
-
-						self.statistics["v"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("convert "):
-					if messageRequest.content == "convert help":
-						embed = discord.Embed(title=":yen: Cryptocurrency conversions", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", convert | convert |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 1
-							else: self.rateLimited[messageRequest.authorId] = 1
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								await self.convert(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "convert")
-
-						self.statistics["convert"] += totalWeight
-				elif messageRequest.content.startswith(("m ", "info", "mcap ", "mc ")):
-					if messageRequest.content.startswith(("mcap ", "mc ")):
-						embed = discord.Embed(title=":tools: Prefix change notice", description="We are changing the prefix used for market information requests from `mcap`, `mc`, and `$` to `m` and `info`. Old prefixes will no longer work starting November 1st 2020.", color=constants.colors["red"])
-						await message.channel.send(embed=embed)
-
-					if messageRequest.content in ["m help", "info help", "mcap help", "mc help"]:
-						embed = discord.Embed(title=":tools: Market information", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", m | m |, info | info |, mcap | mcap |, mc | mc |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 1
-							else: self.rateLimited[messageRequest.authorId] = 1
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								await self.details(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "mcap")
-
-						self.statistics["mcap"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith(("t ", "top")):
-					if messageRequest.content in ["t help", "top help"]:
-						embed = discord.Embed(title=":tools: Rankings", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", t | t |, top | top |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 1
-							else: self.rateLimited[messageRequest.authorId] = 1
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								await self.rankings(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "mcap")
-
-						self.statistics["t"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("mk "):
-					if messageRequest.content == "mk help":
-						embed = discord.Embed(title=":page_facing_up: Market listings", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", mk | mk |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 1
-							else: self.rateLimited[messageRequest.authorId] = 1
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								totalWeight = messageRequest.get_limit()
-								break
-							else:
-								await self.markets(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "mk")
-
-						self.statistics["mk"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("n ") and messageRequest.authorId in [361916376069439490, 164073578696802305, 390170634891689984]:
-					if messageRequest.content == "n help":
-						embed = discord.Embed(title=":newspaper: News", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["gray"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", n | n |, ", messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						if totalWeight > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							if messageRequest.authorId in self.rateLimited: self.rateLimited[messageRequest.authorId] += 1
-							else: self.rateLimited[messageRequest.authorId] = 1
-
-							if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
-								await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
-								self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
-								break
-							else:
-								await self.news(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "n")
-
-						self.statistics["n"] += totalWeight
-						await self.finish_request(message, messageRequest, totalWeight, sentMessages)
-				elif messageRequest.content.startswith("stream ") and messageRequest.authorId in [361916376069439490, 164073578696802305, 390170634891689984]:
-					if message.author.bot: return
-
-					if messageRequest.content == "stream help":
-						embed = discord.Embed(title=":abacus: Data Streams", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(", stream | stream |, ", messageRequest.content.split(" ", 1)[1])
-						if len(requestSlices) > messageRequest.get_limit() / 2:
-							await self.hold_up(message, messageRequest)
-							return
-						for requestSlice in requestSlices:
-							await self.data_stream(message, messageRequest, requestSlice)
-							self.statistics["alerts"] += 1
-						await self.add_tip_message(message, messageRequest, "alerts")
-						
-						await self.finish_request(message, messageRequest, totalWeight, [])
-				elif messageRequest.content.startswith("x ") and messageRequest.authorId == 361916376069439490:
-					if messageRequest.content == "x help":
-						embed = discord.Embed(title=":dart: Alpha Live Trader", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(', x | x |, ', messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						for requestSlice in requestSlices:
-							if messageRequest.content.startswith(("x balance", "x bal")):
-								await self.fetch_live_balance(message, messageRequest, requestSlice)
-							elif messageRequest.content.startswith("x history"):
-								await self.fetch_live_orders(message, messageRequest, requestSlice, "history")
-							elif messageRequest.content.startswith("x orders"):
-								await self.fetch_live_orders(message, messageRequest, requestSlice, "openOrders")
-							elif messageRequest.content.startswith("x reset"):
-								await message.channel.send(content="Nice try")
-							else:
-								await self.process_live_trade(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "x")
-
-						self.statistics["x"] += totalWeight
-				elif messageRequest.content.startswith("paper "):
-					if messageRequest.content == "paper help":
-						embed = discord.Embed(title=":joystick: Alpha Paper Trader", description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors["light blue"])
-						await message.channel.send(embed=embed)
-					else:
-						requestSlices = re.split(', paper | paper |, ', messageRequest.content.split(" ", 1)[1])
-						totalWeight = len(requestSlices)
-						for requestSlice in requestSlices:
-							if messageRequest.content.startswith(("paper balance", "paper bal")):
-								await self.fetch_paper_balance(message, messageRequest, requestSlice)
-							elif messageRequest.content.startswith("paper history"):
-								await self.fetch_paper_orders(message, messageRequest, requestSlice, "history")
-							elif messageRequest.content.startswith("paper orders"):
-								await self.fetch_paper_orders(message, messageRequest, requestSlice, "openOrders")
-							elif messageRequest.content.startswith("paper reset"):
-								await self.reset_paper_balance(message, messageRequest, requestSlice)
-							else:
-								await self.process_paper_trade(message, messageRequest, requestSlice)
-						await self.add_tip_message(message, messageRequest, "paper")
-
-						self.statistics["paper"] += totalWeight
+				command = find_command(messageRequest.content)
+				if command is not None: await self.process_command(message, messageRequest, command, sentMessages)
 			elif messageRequest.content == "brekkeven" and messageRequest.authorId in [361916376069439490, 164073578696802305, 390170634891689984]:
 				if message.author.bot: return
 
@@ -1360,6 +1266,156 @@ class Alpha(discord.AutoShardedClient):
 		except Exception:
 			print(traceback.format_exc())
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+		finally:
+			if accountRecord is not None: accountRecord.unpin()
+
+	def is_potential_request(self, message):
+		"""Checks whether a message needs to be processed before any per-message work is done
+
+		Presets of connected users whose accounts aren't loaded yet are unknown, so their messages are let through.
+
+		Parameters
+		----------
+		message : discord.Message
+			received message
+		"""
+
+		if message.guild is not None and message.guild.id in self.maliciousUsers: return True
+		authorId = message.author.id if message.webhook_id is None else message.webhook_id
+		if authorId not in self.accountProperties and authorId in self.accountIdMap: return True
+		userPresets = self.accountProperties[authorId].get("commandPresets", []) if authorId in self.accountProperties else []
+		guildPresets = self.usedPresetsCache.get(message.guild.id, []) if message.guild is not None else []
+		return may_be_request(message.content, userPresets, guildPresets)
+
+	async def process_command(self, message, messageRequest, command, sentMessages):
+		"""Runs a registered command through the shared request pipeline
+
+		Parameters
+		----------
+		message : discord.Message
+			message the request was received in
+		messageRequest : MessageRequest
+			parsed request
+		command : Command
+			command description found by the first word of the request
+		sentMessages : list
+			messages already sent in response to the request
+		"""
+
+		if message.author.bot and not command.allowsBots: return
+		if messageRequest.guildId == -1 and not command.allowsDirectMessages: return
+		if command.restrictedTo is not None and messageRequest.authorId not in command.restrictedTo: return
+
+		if command.notice is not None:
+			embed = discord.Embed(title=command.notice[0], description=command.notice[1], color=constants.colors["red"])
+			await message.channel.send(embed=embed)
+
+		if command.separator is None:
+			if command.statistic is not None:
+				self.statistics[command.statistic] += 1
+				self.heavyHitters["commands"].add(command.statistic)
+			await getattr(self, command.handler)(message, messageRequest)
+			return
+
+		arguments = messageRequest.content.split(" ", 1)[1]
+		if command.help is not None and arguments == "help":
+			embed = discord.Embed(title=command.help, description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot).", color=constants.colors[command.helpColor])
+			await message.channel.send(embed=embed)
+			return
+
+		requestSlices = command.separator.split(arguments)
+		totalWeight = len(requestSlices)
+		if totalWeight > messageRequest.get_limit() / 2:
+			await self.hold_up(message, messageRequest)
+			return
+
+		if command.statistic is not None: self.heavyHitters["commands"].add(command.statistic, len(requestSlices))
+		if command.isConcurrent and len(requestSlices) > 1:
+			totalWeight = await self.process_concurrent_slices(message, messageRequest, command, requestSlices, sentMessages)
+		else:
+			for requestSlice in requestSlices:
+				if command.weight is not None:
+					self.rateLimited[messageRequest.authorId] = self.rateLimited.get(messageRequest.authorId, 0) + command.weight
+					if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
+						await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
+						self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
+						totalWeight = messageRequest.get_limit()
+						break
+
+				result = await self.process_request_slice(message, messageRequest, command, requestSlice)
+
+				if command.isWeightAdjusted:
+					chartMessages, weight = result
+					sentMessages += chartMessages
+					totalWeight += weight - 1
+					self.rateLimited[messageRequest.authorId] = self.rateLimited.get(messageRequest.authorId, 0) + weight - command.weight
+		await self.add_tip_message(message, messageRequest, command.tip)
+
+		if command.statistic is not None: self.statistics[command.statistic] += totalWeight
+		if command.weight is not None: await self.finish_request(message, messageRequest, totalWeight, sentMessages)
+
+	async def process_concurrent_slices(self, message, messageRequest, command, requestSlices, sentMessages):
+		"""Processes request slices at the same time while delivering replies in the order they were requested
+
+		Weight of all slices is charged before any of them starts. Corrections based on the number of messages each
+		slice sent are applied once all slices are done, unless the request hit the rate limit.
+
+		Parameters
+		----------
+		message : discord.Message
+			message the request was received in
+		messageRequest : MessageRequest
+			parsed request
+		command : Command
+			command description
+		requestSlices : [str]
+			request slices in the order they were typed
+		sentMessages : list
+			messages sent in response to the request, extended with messages sent by the slices
+		"""
+
+		totalWeight = len(requestSlices)
+		isLimitReached = False
+		if command.weight is not None:
+			for i in range(len(requestSlices)):
+				self.rateLimited[messageRequest.authorId] = self.rateLimited.get(messageRequest.authorId, 0) + command.weight
+				if self.rateLimited[messageRequest.authorId] >= messageRequest.get_limit():
+					self.rateLimited[messageRequest.authorId] = messageRequest.get_limit()
+					totalWeight = messageRequest.get_limit()
+					requestSlices, isLimitReached = requestSlices[:i], True
+					break
+
+		semaphore = asyncio.Semaphore(self.requestSliceConcurrency)
+		turns = [asyncio.Event() for _ in requestSlices]
+
+		async def process_in_turn(index, requestSlice):
+			try:
+				async with semaphore:
+					return await self.process_request_slice(message if index == 0 else OrderedMessage(message, turns[index - 1]), messageRequest, command, requestSlice)
+			finally:
+				turns[index].set()
+
+		results = await asyncio.gather(*[process_in_turn(i, requestSlice) for i, requestSlice in enumerate(requestSlices)])
+		if isLimitReached:
+			await message.channel.send(content="<@!{}>".format(messageRequest.authorId), embed=discord.Embed(title="You reached your limit of requests per minute. You can try again in a bit.", color=constants.colors["gray"]))
+
+		if command.isWeightAdjusted:
+			for chartMessages, weight in results:
+				sentMessages += chartMessages
+				if not isLimitReached:
+					totalWeight += weight - 1
+					self.rateLimited[messageRequest.authorId] = self.rateLimited.get(messageRequest.authorId, 0) + weight - command.weight
+
+		return totalWeight
+
+	async def process_request_slice(self, message, messageRequest, command, requestSlice):
+		handler = getattr(self, command.handler)
+		if command.platforms is None:
+			return await handler(message, messageRequest, requestSlice)
+		else:
+			platform = command.platforms.get(requestSlice[:3])
+			if platform is not None: requestSlice = requestSlice[3:]
+			return await handler(message, messageRequest, requestSlice, platform)
 
 
 	# -------------------------
@@ -1370,25 +1426,36 @@ class Alpha(discord.AutoShardedClient):
 		try:
 			if user.id in [487714342301859854, 401328409499664394]: return
 			if reaction.message.author.id in [487714342301859854, 401328409499664394]:
-				try: users = await reaction.users().flatten()
-				except: return
-				if reaction.message.author in users:
+				sentMessage = self.sentMessageRegistry.get(reaction.message.id)
+				if sentMessage is not None or reaction.me:
 					if reaction.emoji == "☑":
 						if reaction.message.guild is not None:
 							guildPermissions = user.permissions_in(reaction.message.channel).manage_messages or user.id in [361916376069439490, 243053168823369728]
-							if len(reaction.message.attachments) == 0:
-								try: await reaction.message.delete()
-								except: pass
-							elif str(user.id) in reaction.message.attachments[0].filename or guildPermissions:
+							isOwner = sentMessage[0] == user.id if sentMessage is not None else len(reaction.message.attachments) != 0 and str(user.id) in reaction.message.attachments[0].filename
+							if len(reaction.message.attachments) == 0 or isOwner or guildPermissions:
 								try: await reaction.message.delete()
 								except: pass
 						else:
 							await reaction.message.delete()
 					elif reaction.emoji == '❌' and len(reaction.message.embeds) == 1:
+						await self.load_account(user.id)
+						if user.id not in self.accountProperties: return
 						titleText = reaction.message.embeds[0].title
 						footerText = reaction.message.embeds[0].footer.text
-						if footerText.startswith("Alert") and " ● id: " in footerText:
-							alertId = footerText.split(" ● id: ")[1]
+						if sentMessage is not None:
+							if sentMessage[0] != user.id: return
+							kind, payloadId = sentMessage[1], sentMessage[2]
+						elif footerText.startswith("Alert") and " ● id: " in footerText:
+							kind, payloadId = "alert", footerText.split(" ● id: ")[1]
+						elif footerText.startswith("Paper order") and " ● id: " in footerText:
+							kind, payloadId = "paper order", footerText.split(" ● id: ")[1]
+						elif " → `" in titleText and titleText.endswith("`"):
+							kind, payloadId = "preset", titleText.split("`")[1]
+						else:
+							return
+
+						if kind == "alert":
+							alertId = payloadId
 							marketAlerts = self.accountProperties[user.id]["marketAlerts"]
 
 							for id in supported.cryptoExchanges["Alpha Market Alerts"]:
@@ -1400,14 +1467,14 @@ class Alpha(discord.AutoShardedClient):
 												deletedAlerts.append(alert)
 										if len(deletedAlerts) == 1:
 											marketAlerts[id][ticker].remove(deletedAlerts[0])
-											database.document("accounts/{}".format(self.account_id_for(user.id))).set({"marketAlerts": {id: {ticker: marketAlerts[id][ticker]}}}, merge=True)
+											self.accountWriter.merge(self.account_id_for(user.id), {"marketAlerts": {id: {ticker: marketAlerts[id][ticker]}}})
 											embed = discord.Embed(title="Alert deleted", color=constants.colors["gray"])
 											embed.set_footer(text=footerText)
 											try: await reaction.message.edit(embed=embed)
 											except: pass
 											break
-						elif footerText.startswith("Paper order") and " ● id: " in footerText:
-							orderId = footerText.split(" ● id: ")[1]
+						elif kind == "paper order":
+							orderId = payloadId
 							paper = self.accountProperties[user.id]["paperTrader"]
 
 							for id in supported.cryptoExchanges["Alpha Paper Trader"]:
@@ -1424,16 +1491,16 @@ class Alpha(discord.AutoShardedClient):
 										elif order["orderType"] == "sell":
 											paper[id]["balance"][order["base"]]["amount"] += order["amount"]
 										paper[id]["openOrders"].remove(order)
-										database.document("accounts/{}".format(self.account_id_for(user.id))).set({"paperTrader": paper}, merge=True)
+										self.accountWriter.merge(self.account_id_for(user.id), {"paperTrader": paper})
 										embed = discord.Embed(title="Paper order canceled", color=constants.colors["gray"])
 										embed.set_footer(text=footerText)
 										try: await reaction.message.edit(embed=embed)
 										except: pass
 										break
-						elif " → `" in titleText and titleText.endswith("`"):
+						elif kind == "preset":
 							properties = self.accountProperties[user.id]
-							properties, _ = Presets.update_presets(properties, remove=titleText.split("`")[1])
-							database.document("accounts/{}".format(self.account_id_for(user.id))).set({"commandPresets": properties["commandPresets"]}, merge=True)
+							properties, _ = Presets.update_presets(properties, remove=payloadId)
+							self.accountWriter.merge(self.account_id_for(user.id), {"commandPresets": properties["commandPresets"]})
 
 							embed = discord.Embed(title="Preset deleted", color=constants.colors["gray"])
 							embed.set_footer(text=footerText)
@@ -1445,21 +1512,107 @@ class Alpha(discord.AutoShardedClient):
 			if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
 
 	async def finish_request(self, message, messageRequest, weight, sentMessages):
-		await asyncio.sleep(60)
-		if messageRequest.authorId in self.rateLimited:
-			self.rateLimited[messageRequest.authorId] -= weight
-			if self.rateLimited[messageRequest.authorId] < 1: self.rateLimited.pop(messageRequest.authorId, None)
+		"""Schedules release of request weight and cleanup of sent messages once the rate limit window passes
+
+		Only message ids are kept until the cleanup runs.
+
+		Parameters
+		----------
+		message : discord.Message
+			message the request was received in
+		messageRequest : MessageRequest
+			parsed request
+		weight : int
+			request weight charged to the user
+		sentMessages : [discord.Message]
+			messages sent in response to the request
+		"""
 
-		if len(sentMessages) != 0 and messageRequest.autodelete:
-			try: await message.delete()
-			except: pass
+		cleanup = None
+		if len(sentMessages) != 0:
+			messageIds = [(e.channel.id, e.id) for e in sentMessages]
+			if messageRequest.autodelete: messageIds.insert(0, (message.channel.id, message.id))
+			cleanup = (messageRequest.autodelete, messageIds)
+		self.rateLimiter.schedule_release(messageRequest.authorId, weight, cleanup)
 
-		for message in sentMessages:
+	async def scheduler_queue(self):
+		"""Expires request weight, confirmations and cleans up finished requests as long as Alpha Bot is online
+
+		"""
+
+		while True:
 			try:
-				if messageRequest.autodelete: await message.delete()
-				else: await message.remove_reaction("☑", message.channel.guild.me)
-			except: pass
+				await asyncio.sleep(1)
+				self.confirmations.tick()
+				cleanups = self.rateLimiter.tick()
+				if len(cleanups) == 0: continue
+
+				actions = []
+				for autodelete, messageIds in cleanups:
+					for channelId, messageId in messageIds:
+						if autodelete: actions.append(self.http.delete_message(channelId, messageId))
+						else: actions.append(self.http.remove_own_reaction(channelId, messageId, "☑"))
+				await asyncio.gather(*actions, return_exceptions=True)
+			except asyncio.CancelledError: return
+			except Exception:
+				print(traceback.format_exc())
+				if os.environ["PRODUCTION_MODE"]: self.logging.report_exception()
+
+	async def execute_data_server_request(self, authorId, endpoint, request):
+		"""Sends a request to the data server, answering it without a payload when it didn't finish before the
+		deadline of its endpoint
+
+		Parameters
+		----------
+		authorId : int
+			id of the user the request was made by
+		endpoint : str
+			data server endpoint
+		request : object
+			processed request
+		"""
+
+		try:
+			return await self.dataServerDeadlines.run(endpoint, Processor.execute_data_server_request(authorId, endpoint, request))
+		except asyncio.TimeoutError:
+			return (None, self.dataServerTimeoutText)
+
+	def track_request(self, request, timeframes=None):
+		"""Counts the ticker, platform and timeframes of a parsed request in the heavy hitter sketches
+
+		Commands are counted by their statistic in `process_command`.
 
+		Parameters
+		----------
+		request : object
+			processed request with a ticker
+		timeframes : list
+			requested timeframes, if any
+		"""
+
+		self.heavyHitters["tickers"].add(request.get_ticker().id)
+		self.heavyHitters["platforms"].add(request.currentPlatform)
+		for timeframe in ([] if timeframes is None else timeframes):
+			self.heavyHitters["timeframes"].add(getattr(timeframe, "name", timeframe))
+
+	def collect_metrics(self):
+		return {
+			"rate limiter": self.rateLimiter.metrics(),
+			"confirmations": self.confirmations.metrics(),
+			"sent messages": self.sentMessageRegistry.metrics(),
+			"quote cache": self.quoteCache.metrics(),
+			"chart cache": self.chartCache.metrics(),
+			"unavailable responses": self.unavailableResponses.metrics(),
+			"data server": self.dataServerDeadlines.metrics(),
+			"pre-rendering": self.prerenderStatistics,
+			"account writes": self.accountWriter.metrics(),
+			"loop guard": database.metrics(),
+			"snapshots": self.snapshots.metrics(),
+			"account records": AccountRecord.cache.metrics(),
+			"unknown accounts": self.unknownAccounts.metrics(),
+			"account subscriptions": self.accountSubscriptions.metrics(),
+			"heavy hitters": {name: sketch.metrics() for name, sketch in self.heavyHitters.items()}
+		}
 
 	# -------------------------
 	# Help functionality
@@ -1487,6 +1640,50 @@ class Alpha(discord.AutoShardedClient):
 		else:
 			await message.channel.send(embed=embed)
 
+	async def ask_assistant(self, message, messageRequest):
+		if messageRequest.content == messageRequest.raw.lower():
+			rawCaps = messageRequest.raw.split(" ", 1)[1]
+		else:
+			rawCaps = messageRequest.content.split(" ", 1)[1]
+		
+		if len(rawCaps) > 500: return
+		if messageRequest.guildProperties["settings"]["assistant"]["enabled"]:
+			await message.channel.trigger_typing()
+		fallThrough, response = await self.assistant.process_reply(messageRequest.content, rawCaps, messageRequest.guildProperties["settings"]["assistant"]["enabled"])
+
+		if fallThrough:
+			if response == "help":
+				await self.help(message, messageRequest)
+			elif response == "ping":
+				await message.channel.send(content="Pong")
+			elif response == "pro":
+				await message.channel.send(content="Visit https://www.alphabotsystem.com/pro to learn more about Alpha Pro and how to start your free trial.")
+			elif response == "invite":
+				await message.channel.send(content="https://discord.com/oauth2/authorize?client_id=401328409499664394&scope=bot&permissions=604372032")
+			elif response == "vote":
+				await message.channel.send(content="https://top.gg/bot/401328409499664394/vote")
+			elif response == "referrals":
+				embed = discord.Embed(title="Alpha referral links", color=constants.colors["deep purple"])
+				embed.add_field(name="Binance", value="Get 10% kickback on all commissions when trading on Binance by [signing up here](https://www.binance.com/en/register?ref=PJF2KLMW)", inline=False)
+				embed.add_field(name="Bitmex", value="Get 10% fee discount for the first 6 months when trading on BitMEX by [signing up here](https://www.bitmex.com/register/Cz9JxF)", inline=False)
+				embed.add_field(name="TradingView", value="Get $30 after purchasing a paid plan on TradingView by [signing up here](https://www.tradingview.com/gopro/?share_your_love=AlphaBotSystem)", inline=False)
+				embed.add_field(name="FTX", value="Get a 5% fee discount on all your trades on FTX by [signing up here](https://ftx.com/#a=Alpha)", inline=False)
+				embed.add_field(name="Coinbase", value="Get $13 on Coinbase after [signing up here](https://www.coinbase.com/join/conrad_78)", inline=False)
+				embed.add_field(name="Deribit", value="Get 10% fee discount for the first 6 months when trading on Deribit by [signing up here](https://www.deribit.com/reg-8980.6502)", inline=False)
+				await message.channel.send(embed=embed)
+			elif response == "settings":
+				pass
+		elif response is not None and response != "":
+			await message.channel.send(content=response)
+
+	async def settings_notice(self, message, messageRequest):
+		if messageRequest.content == "set help":
+			embed = discord.Embed(title=":control_knobs: Functionality Settings", description="Sign into [your Alpha Account](https://www.alphabotsystem.com/account) to access your personal and community Discord preferences.", color=constants.colors["light blue"])
+			await message.channel.send(embed=embed)
+		else:
+			embed = discord.Embed(title=":control_knobs: Functionality Settings", description="All personal and community preferences have been moved to our website. Sign into [your Alpha Account](https://www.alphabotsystem.com/account) to access them.", color=constants.colors["deep purple"])
+			await message.channel.send(embed=embed)
+
 	async def add_tip_message(self, message, messageRequest, command=None):
 		if random.randint(0, 5) == 1 and not messageRequest.ads_disabled():
 			c = command
@@ -1534,9 +1731,8 @@ class Alpha(discord.AutoShardedClient):
 					properties, statusParts = Presets.update_presets(messageRequest.accountProperties, add=title, shortcut=shortcut, messageRequest=messageRequest)
 					statusTitle, statusMessage, statusColor = statusParts
 					if messageRequest.accountProperties["customer"]["addons"].get("commandPresets", 0) == 0:
-						subscription = stripe.Subscription.retrieve(messageRequest.accountProperties["customer"]["personalSubscription"]["subscription"])
-						stripe.SubscriptionItem.create_usage_record(subscription["items"]["data"][0]["id"], quantity=10, timestamp=int(time.time()))
-					database.document("accounts/{}".format(self.account_id_for(messageRequest.authorId))).set({"commandPresets": properties["commandPresets"], "customer": {"addons": {"commandPresets": 1}}}, merge=True)
+						await client.loop.run_in_executor(self.executor, self.report_usage, messageRequest.accountProperties["customer"]["personalSubscription"]["subscription"], 10)
+					self.accountWriter.merge(self.account_id_for(messageRequest.authorId), {"commandPresets": properties["commandPresets"], "customer": {"addons": {"commandPresets": 1}}})
 
 					embed = discord.Embed(title=statusMessage, color=constants.colors[statusColor])
 					embed.set_author(name=statusTitle, icon_url=static_storage.icon)
@@ -1556,6 +1752,7 @@ class Alpha(discord.AutoShardedClient):
 							embed.set_footer(text="Preset {}/{}".format(i + 1, numberOfPresets))
 							presetMessage = await message.channel.send(embed=embed)
 							sentMessages.append(presetMessage)
+							self.sentMessageRegistry.register(presetMessage.id, messageRequest.authorId, "preset", phrase)
 							try: await presetMessage.add_reaction('❌')
 							except: pass
 					else:
@@ -1591,24 +1788,30 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
-			for timeframe in request.get_timeframes():
-				async with message.channel.typing():
-					request.set_current(timeframe=timeframe)
-					payload, chartText = await Processor.execute_data_server_request(messageRequest.authorId, "chart", request)
-
-				if payload is None:
-					errorMessage = "Requested chart for `{}` is not available.".format(request.get_ticker().name) if chartText is None else chartText
-					embed = discord.Embed(title=errorMessage, color=constants.colors["gray"])
-					embed.set_author(name="Chart not available", icon_url=static_storage.icon_bw)
-					chartMessage = await message.channel.send(embed=embed)
-					sentMessages.append(chartMessage)
-					try: await chartMessage.add_reaction("☑")
-					except: pass
-				else:
-					chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
-					sentMessages.append(chartMessage)
-					try: await chartMessage.add_reaction("☑")
-					except: pass
+			self.track_request(request, request.get_timeframes())
+			async with message.channel.typing():
+				responses = self.fetch_timeframes(messageRequest, "chart", request)
+				try:
+					for response in responses:
+						payload, chartText = await response
+
+						if payload is None:
+							errorMessage = "Requested chart for `{}` is not available.".format(request.get_ticker().name) if chartText is None else chartText
+							embed = discord.Embed(title=errorMessage, color=constants.colors["gray"])
+							embed.set_author(name="Chart not available", icon_url=static_storage.icon_bw)
+							chartMessage = await message.channel.send(embed=embed)
+							sentMessages.append(chartMessage)
+							self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
+							try: await chartMessage.add_reaction("☑")
+							except: pass
+						else:
+							chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
+							sentMessages.append(chartMessage)
+							self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
+							try: await chartMessage.add_reaction("☑")
+							except: pass
+				finally:
+					for response in responses: response.cancel()
 			
 			autodeleteOverride = request.find_parameter_in_list("autoDeleteOverride", request.get_filters(), default=False)
 			messageRequest.autodelete = messageRequest.autodelete or autodeleteOverride
@@ -1637,24 +1840,29 @@ class Alpha(discord.AutoShardedClient):
 				await message.channel.send(embed=embed)
 				return (sentMessages, len(sentMessages))
 
-			for timeframe in request.get_timeframes():
-				async with message.channel.typing():
-					request.set_current(timeframe=timeframe)
-					payload, chartText = await Processor.execute_data_server_request(messageRequest.authorId, "chart", request)
-
-			if payload is None:
-				errorMessage = "Requested orderflow data for `{}` is not available.".format(request.get_ticker().name) if chartText is None else chartText
-				embed = discord.Embed(title=errorMessage, color=constants.colors["gray"])
-				embed.set_author(name="Data not available", icon_url=static_storage.icon_bw)
-				chartMessage = await message.channel.send(embed=embed)
-				sentMessages.append(chartMessage)
-				try: await chartMessage.add_reaction("☑")
-				except: pass
-			else:
-				chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
-				sentMessages.append(chartMessage)
-				try: await chartMessage.add_reaction("☑")
-				except: pass
+			async with message.channel.typing():
+				responses = self.fetch_timeframes(messageRequest, "chart", request)
+				try:
+					for response in responses:
+						payload, chartText = await response
+
+						if payload is None:
+							errorMessage = "Requested orderflow data for `{}` is not available.".format(request.get_ticker().name) if chartText is None else chartText
+							embed = discord.Embed(title=errorMessage, color=constants.colors["gray"])
+							embed.set_author(name="Data not available", icon_url=static_storage.icon_bw)
+							chartMessage = await message.channel.send(embed=embed)
+							sentMessages.append(chartMessage)
+							self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
+							try: await chartMessage.add_reaction("☑")
+							except: pass
+						else:
+							chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
+							sentMessages.append(chartMessage)
+							self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
+							try: await chartMessage.add_reaction("☑")
+							except: pass
+				finally:
+					for response in responses: response.cancel()
 
 			autodeleteOverride = request.find_parameter_in_list("autoDeleteOverride", request.get_filters(), default=False)
 			messageRequest.autodelete = messageRequest.autodelete or autodeleteOverride
@@ -1678,24 +1886,29 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
-			for timeframe in request.get_timeframes():
-				async with message.channel.typing():
-					request.set_current(timeframe=timeframe)
-					payload, chartText = await Processor.execute_data_server_request(messageRequest.authorId, "heatmap", request)
-
-				if payload is None:
-					errorMessage = "Requested heat map is not available." if chartText is None else chartText
-					embed = discord.Embed(title=errorMessage, color=constants.colors["gray"])
-					embed.set_author(name="Heat map not available", icon_url=static_storage.icon_bw)
-					chartMessage = await message.channel.send(embed=embed)
-					sentMessages.append(chartMessage)
-					try: await chartMessage.add_reaction("☑")
-					except: pass
-				else:
-					chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
-					sentMessages.append(chartMessage)
-					try: await chartMessage.add_reaction("☑")
-					except: pass
+			async with message.channel.typing():
+				responses = self.fetch_timeframes(messageRequest, "heatmap", request)
+				try:
+					for response in responses:
+						payload, chartText = await response
+
+						if payload is None:
+							errorMessage = "Requested heat map is not available." if chartText is None else chartText
+							embed = discord.Embed(title=errorMessage, color=constants.colors["gray"])
+							embed.set_author(name="Heat map not available", icon_url=static_storage.icon_bw)
+							chartMessage = await message.channel.send(embed=embed)
+							sentMessages.append(chartMessage)
+							self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
+							try: await chartMessage.add_reaction("☑")
+							except: pass
+						else:
+							chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
+							sentMessages.append(chartMessage)
+							self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
+							try: await chartMessage.add_reaction("☑")
+							except: pass
+				finally:
+					for response in responses: response.cancel()
 
 			autodeleteOverride = request.find_parameter_in_list("autoDeleteOverride", request.get_filters(), default=False)
 			messageRequest.autodelete = messageRequest.autodelete or autodeleteOverride
@@ -1706,6 +1919,77 @@ class Alpha(discord.AutoShardedClient):
 			await self.unknown_error(message, messageRequest.authorId, report=True)
 		return (sentMessages, len(sentMessages))
 
+	def fetch_timeframes(self, messageRequest, endpoint, request, isPrerendered=False):
+		"""Requests all timeframes of a chart request from the data server at the same time
+
+		Every timeframe but the last one is requested with a shallow copy of the request set to that timeframe, the
+		original request is left set to the last timeframe. Returns data server responses as futures in timeframe
+		order, callers cancel the ones they stop waiting for.
+
+		Parameters
+		----------
+		messageRequest : MessageRequest
+			parsed request
+		endpoint : str
+			data server endpoint
+		request : ChartRequest
+			processed chart or heat map request
+		isPrerendered : bool
+			whether the charts are requested ahead of users to warm the chart cache
+		"""
+
+		responses = []
+		timeframes = request.get_timeframes()
+		for i, timeframe in enumerate(timeframes):
+			timeframeRequest = request if i == len(timeframes) - 1 else copy.copy(request)
+			timeframeRequest.set_current(timeframe=timeframe)
+			responses.append(asyncio.ensure_future(self.fetch_chart(messageRequest, endpoint, timeframeRequest, timeframe, isPrerendered)))
+		return responses
+
+	async def fetch_chart(self, messageRequest, endpoint, request, timeframe, isPrerendered=False):
+		"""Requests a chart from the data server unless the same chart was rendered within the current candle
+
+		Charts are cached for the length of a candle of the requested timeframe, at most `chartCacheMaxAge` seconds.
+		Timeframes unknown to Utils.get_frequency_time are cached for a minute.
+		Charts the data server recently had no data for are answered locally.
+
+		Parameters
+		----------
+		messageRequest : MessageRequest
+			parsed request
+		endpoint : str
+			data server endpoint
+		request : ChartRequest
+			processed chart or heat map request set to a single timeframe
+		timeframe : str
+			requested timeframe
+		isPrerendered : bool
+			whether the chart is requested ahead of users to warm the chart cache
+		"""
+
+		fingerprint = ChartCache.fingerprint(request, timeframe)
+		failure = self.unavailableResponses.get((endpoint, fingerprint))
+		if failure is not None: return failure
+
+		frequency = min(Utils.get_frequency_time(str(timeframe)) or 60, self.chartCacheMaxAge)
+		key = (endpoint, fingerprint, int(time.time() // frequency))
+		cached = self.chartCache.get(key)
+		if cached is not None:
+			if not isPrerendered and key in self.prerenderedCharts:
+				self.prerenderedCharts.discard(key)
+				self.prerenderStatistics["hits"] += 1
+			return io.BytesIO(cached[0]), cached[1]
+
+		payload, chartText = await self.execute_data_server_request(messageRequest.authorId, endpoint, request)
+		if payload is None:
+			if chartText != self.dataServerTimeoutText: self.unavailableResponses.store((endpoint, fingerprint), (payload, chartText))
+		else:
+			image = payload.read()
+			payload.seek(0)
+			self.chartCache.store(key, image, chartText)
+			if isPrerendered: self.prerenderedCharts.add(key)
+		return payload, chartText
+
 	async def depth(self, message, messageRequest, requestSlice, platform):
 		sentMessages = []
 		try:
@@ -1719,19 +2003,28 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
-			async with message.channel.typing():
-				payload, chartText = await Processor.execute_data_server_request(messageRequest.authorId, "depth", request)
+			self.track_request(request)
+			failureKey = ("depth", ChartCache.fingerprint(request))
+			failure = self.unavailableResponses.get(failureKey)
+			if failure is not None:
+				payload, chartText = failure
+			else:
+				async with message.channel.typing():
+					payload, chartText = await self.execute_data_server_request(messageRequest.authorId, "depth", request)
+				if payload is None and chartText != self.dataServerTimeoutText: self.unavailableResponses.store(failureKey, (payload, chartText))
 
 			if payload is None:
 				embed = discord.Embed(title="Requested orderbook visualization for `{}` is not available.".format(request.get_ticker().name), color=constants.colors["gray"])
 				embed.set_author(name="Chart not available", icon_url=static_storage.icon_bw)
 				chartMessage = await message.channel.send(embed=embed)
 				sentMessages.append(chartMessage)
+				self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
 				try: await chartMessage.add_reaction("☑")
 				except: pass
 			else:
 				chartMessage = await message.channel.send(content=chartText, file=discord.File(payload, "{:.0f}-{}.png".format(time.time(), messageRequest.authorId)))
 				sentMessages.append(chartMessage)
+				self.sentMessageRegistry.register(chartMessage.id, messageRequest.authorId, "chart")
 				try: await chartMessage.add_reaction("☑")
 				except: pass
 
@@ -1815,9 +2108,8 @@ class Alpha(discord.AutoShardedClient):
 
 					marketAlerts[databaseKey].append(newAlert)
 					if messageRequest.accountProperties["customer"]["addons"].get("marketAlerts", 0) == 0:
-						subscription = stripe.Subscription.retrieve(messageRequest.accountProperties["customer"]["personalSubscription"]["subscription"])
-						stripe.SubscriptionItem.create_usage_record(subscription["items"]["data"][0]["id"], quantity=20, timestamp=int(time.time()))
-					database.document("accounts/{}".format(self.account_id_for(messageRequest.authorId))).set({"marketAlerts": {exchange.id: marketAlerts}, "customer": {"addons": {"marketAlerts": 1}}}, merge=True)
+						await client.loop.run_in_executor(self.executor, self.report_usage, messageRequest.accountProperties["customer"]["personalSubscription"]["subscription"], 20)
+					self.accountWriter.merge(self.account_id_for(messageRequest.authorId), {"marketAlerts": {exchange.id: marketAlerts}, "customer": {"addons": {"marketAlerts": 1}}})
 
 					embed = discord.Embed(title="{} alert set for {} ({}) at {} {}.".format(action.title(), ticker.base, exchange.name, request.get_numerical_parameters()[0], ticker.quote), color=constants.colors["deep purple"])
 					embed.set_author(name="Alert successfully set", icon_url=static_storage.icon)
@@ -1849,6 +2141,7 @@ class Alpha(discord.AutoShardedClient):
 										embed.set_footer(text="Alert {}/{} on {} ● id: {}".format(index, totalAlertCount, TickerParser.exchanges[id].name, alert["id"]))
 										alertMessage = await message.channel.send(embed=embed)
 										sentMessages.append(alertMessage)
+										self.sentMessageRegistry.register(alertMessage.id, messageRequest.authorId, "alert", alert["id"])
 										try: await alertMessage.add_reaction('❌')
 										except: pass
 					if not hasAlerts:
@@ -1866,6 +2159,28 @@ class Alpha(discord.AutoShardedClient):
 			await self.unknown_error(message, messageRequest.authorId, report=True)
 		return (sentMessages, len(sentMessages))
 
+	async def fetch_quote(self, messageRequest, request):
+		"""Requests a quote from the data server, sharing recent and in-flight responses between identical requests
+
+		Quotes the data server recently had no data for are answered locally.
+
+		Parameters
+		----------
+		messageRequest : MessageRequest
+			parsed request
+		request : QuoteRequest
+			processed quote request
+		"""
+
+		ticker, exchange = request.get_ticker(), request.get_exchange()
+		key = (request.currentPlatform, None if exchange is None else exchange.id, ticker.id, tuple(sorted([e.id for e in request.get_filters()])))
+		failure = self.unavailableResponses.get(("quote",) + key)
+		if failure is not None: return failure
+
+		response = await self.quoteCache.get(key, lambda: self.execute_data_server_request(messageRequest.authorId, "quote", request))
+		if response[0] is None and response[1] != self.dataServerTimeoutText: self.unavailableResponses.store(("quote",) + key, response)
+		return response
+
 	async def price(self, message, messageRequest, requestSlice, platform):
 		sentMessages = []
 		try:
@@ -1879,8 +2194,9 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
+			self.track_request(request)
 			async with message.channel.typing():
-				payload, quoteText = await Processor.execute_data_server_request(messageRequest.authorId, "quote", request)
+				payload, quoteText = await self.fetch_quote(messageRequest, request)
 
 			if payload is None or payload["quotePrice"] is None:
 				errorMessage = "Requested price for `{}` is not available.".format(request.get_ticker().name) if quoteText is None else quoteText
@@ -1888,6 +2204,7 @@ class Alpha(discord.AutoShardedClient):
 				embed.set_author(name="Data not available", icon_url=static_storage.icon_bw)
 				quoteMessage = await message.channel.send(embed=embed)
 				sentMessages.append(quoteMessage)
+				self.sentMessageRegistry.register(quoteMessage.id, messageRequest.authorId, "quote")
 				try: await quoteMessage.add_reaction("☑")
 				except: pass
 			else:
@@ -1930,8 +2247,9 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
+			self.track_request(request)
 			async with message.channel.typing():
-				payload, quoteText = await Processor.execute_data_server_request(messageRequest.authorId, "quote", request)
+				payload, quoteText = await self.fetch_quote(messageRequest, request)
 
 			if payload is None or payload["quoteVolume"] is None:
 				errorMessage = "Requested volume for `{}` is not available.".format(request.get_ticker().name) if quoteText is None else quoteText
@@ -1939,6 +2257,7 @@ class Alpha(discord.AutoShardedClient):
 				embed.set_author(name="Data not available", icon_url=static_storage.icon_bw)
 				quoteMessage = await message.channel.send(embed=embed)
 				sentMessages.append(quoteMessage)
+				self.sentMessageRegistry.register(quoteMessage.id, messageRequest.authorId, "quote")
 				try: await quoteMessage.add_reaction("☑")
 				except: pass
 			else:
@@ -2018,6 +2337,7 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
+			self.track_request(request)
 			ticker = request.get_ticker()
 			if ticker.base in TickerParser.coinGeckoIndex:
 				await message.channel.trigger_typing()
@@ -2127,7 +2447,7 @@ class Alpha(discord.AutoShardedClient):
 				else:
 					response = []
 					async with message.channel.typing():
-						rawData = database.document("dataserver/statistics").get().to_dict()
+						rawData = await asyncDatabase.get("dataserver/statistics")
 						response = rawData["top"][messageRequest.guildProperties["settings"]["messageProcessing"]["bias"]][:9:-1]
 
 					embed = discord.Embed(title="Top Alpha Bot requests", color=constants.colors["deep purple"])
@@ -2180,6 +2500,7 @@ class Alpha(discord.AutoShardedClient):
 					sentMessages.append(await message.channel.send(embed=embed))
 				return (sentMessages, len(sentMessages))
 
+			self.track_request(request)
 			await message.channel.trigger_typing()
 
 			listings, total = TickerParser.get_listings(request.get_ticker())
@@ -2249,6 +2570,18 @@ class Alpha(discord.AutoShardedClient):
 	# Live Trading
 	# -------------------------
 
+	async def live_trading(self, message, messageRequest, requestSlice):
+		if messageRequest.content.startswith(("x balance", "x bal")):
+			await self.fetch_live_balance(message, messageRequest, requestSlice)
+		elif messageRequest.content.startswith("x history"):
+			await self.fetch_live_orders(message, messageRequest, requestSlice, "history")
+		elif messageRequest.content.startswith("x orders"):
+			await self.fetch_live_orders(message, messageRequest, requestSlice, "openOrders")
+		elif messageRequest.content.startswith("x reset"):
+			await message.channel.send(content="Nice try")
+		else:
+			await self.process_live_trade(message, messageRequest, requestSlice)
+
 	async def process_live_trade(self, message, messageRequest, requestSlice):
 		sentMessages = []
 		try:
@@ -2277,7 +2610,7 @@ class Alpha(discord.AutoShardedClient):
 				ticker = request.get_ticker()
 
 				async with message.channel.typing():
-					payload, quoteText = await Processor.execute_data_server_request(messageRequest.authorId, "quote", request)
+					payload, quoteText = await self.execute_data_server_request(messageRequest.authorId, "quote", request)
 
 				if payload is None or payload["quotePrice"] is None:
 					errorMessage = "Requested live {} order for {} could not be executed.".format(orderType.replace("-", " "), ticker.name) if quoteText is None else quoteText
@@ -2285,6 +2618,7 @@ class Alpha(discord.AutoShardedClient):
 					embed.set_author(name="Data not available", icon_url=static_storage.icon_bw)
 					quoteMessage = await message.channel.send(embed=embed)
 					sentMessages.append(quoteMessage)
+					self.sentMessageRegistry.register(quoteMessage.id, messageRequest.authorId, "quote")
 					try: await quoteMessage.add_reaction("☑")
 					except: pass
 				else:
@@ -2299,24 +2633,12 @@ class Alpha(discord.AutoShardedClient):
 					embed = discord.Embed(title=confirmationText, description=pendingOrder.conversionText, color=constants.colors["pink"])
 					embed.set_author(name="Live order confirmation", icon_url=payload["thumbnailUrl"])
 					orderConfirmationMessage = await message.channel.send(embed=embed)
-					self.lockedUsers.add(messageRequest.authorId)
-
-					def confirm_order(m):
-						if m.author.id == messageRequest.authorId:
-							response = ' '.join(m.clean_content.lower().split())
-							if response.startswith(("y", "yes", "sure", "confirm", "execute")): return True
-							elif response.startswith(("n", "no", "cancel", "discard", "reject")): raise Exception()
-
-					try:
-						this = await client.wait_for('message', timeout=60.0, check=confirm_order)
-					except:
-						self.lockedUsers.discard(messageRequest.authorId)
+					if not await self.confirmations.confirm(messageRequest.authorId, message.channel.id):
 						embed = discord.Embed(title="Order canceled", description="~~{}~~".format(confirmationText), color=constants.colors["gray"])
 						embed.set_author(name="Alpha Live Trader", icon_url=static_storage.icon_bw)
 						try: await orderConfirmationMessage.edit(embed=embed)
 						except: pass
 					else:
-						self.lockedUsers.discard(messageRequest.authorId)
 						async with message.channel.typing():
 							response = self.liveTrader.post_trade(messageRequest, request, pendingOrder)
 							if response is None:
@@ -2354,6 +2676,18 @@ class Alpha(discord.AutoShardedClient):
 	# Paper Trading
 	# -------------------------
 
+	async def paper_trading(self, message, messageRequest, requestSlice):
+		if messageRequest.content.startswith(("paper balance", "paper bal")):
+			await self.fetch_paper_balance(message, messageRequest, requestSlice)
+		elif messageRequest.content.startswith("paper history"):
+			await self.fetch_paper_orders(message, messageRequest, requestSlice, "history")
+		elif messageRequest.content.startswith("paper orders"):
+			await self.fetch_paper_orders(message, messageRequest, requestSlice, "openOrders")
+		elif messageRequest.content.startswith("paper reset"):
+			await self.reset_paper_balance(message, messageRequest, requestSlice)
+		else:
+			await self.process_paper_trade(message, messageRequest, requestSlice)
+
 	async def fetch_paper_balance(self, message, messageRequest, requestSlice):
 		sentMessages = []
 		try:
@@ -2517,6 +2851,7 @@ class Alpha(discord.AutoShardedClient):
 								embed.set_footer(text="Paper order {}/{} ● id: {}".format(i + 1, len(paper[exchange.id]["openOrders"]), order["id"]))
 								orderMessage = await message.channel.send(embed=embed)
 								sentMessages.append(orderMessage)
+								self.sentMessageRegistry.register(orderMessage.id, messageRequest.authorId, "paper order", order["id"])
 								await orderMessage.add_reaction('❌')
 				else:
 					embed = discord.Embed(title="{} exchange is not supported.".format(exchange.name), description="Detailed guide with examples is available on [our website](https://www.alphabotsystem.com/guide/alpha-bot/paper-trader).", color=constants.colors["gray"])
@@ -2556,7 +2891,7 @@ class Alpha(discord.AutoShardedClient):
 				ticker = request.get_ticker()
 
 				async with message.channel.typing():
-					payload, quoteText = await Processor.execute_data_server_request(messageRequest.authorId, "quote", request)
+					payload, quoteText = await self.fetch_quote(messageRequest, request)
 
 				if payload is None or payload["quotePrice"] is None:
 					errorMessage = "Requested paper {} order for {} could not be executed.".format(orderType.replace("-", " "), ticker.name) if quoteText is None else quoteText
@@ -2564,6 +2899,7 @@ class Alpha(discord.AutoShardedClient):
 					embed.set_author(name="Data not available", icon_url=static_storage.icon_bw)
 					quoteMessage = await message.channel.send(embed=embed)
 					sentMessages.append(quoteMessage)
+					self.sentMessageRegistry.register(quoteMessage.id, messageRequest.authorId, "quote")
 					try: await quoteMessage.add_reaction("☑")
 					except: pass
 				else:
@@ -2578,24 +2914,12 @@ class Alpha(discord.AutoShardedClient):
 					embed = discord.Embed(title=confirmationText, description=pendingOrder.conversionText, color=constants.colors["pink"])
 					embed.set_author(name="Paper order confirmation", icon_url=payload["thumbnailUrl"])
 					orderConfirmationMessage = await message.channel.send(embed=embed)
-					self.lockedUsers.add(messageRequest.authorId)
-
-					def confirm_order(m):
-						if m.author.id == messageRequest.authorId:
-							response = ' '.join(m.clean_content.lower().split())
-							if response.startswith(("y", "yes", "sure", "confirm", "execute")): return True
-							elif response.startswith(("n", "no", "cancel", "discard", "reject")): raise Exception()
-
-					try:
-						this = await client.wait_for('message', timeout=60.0, check=confirm_order)
-					except:
-						self.lockedUsers.discard(messageRequest.authorId)
+					if not await self.confirmations.confirm(messageRequest.authorId, message.channel.id):
 						embed = discord.Embed(title="Paper order canceled", description="~~{}~~".format(confirmationText), color=constants.colors["gray"])
 						embed.set_author(name="Alpha Paper Trader", icon_url=static_storage.icon_bw)
 						try: await orderConfirmationMessage.edit(embed=embed)
 						except: pass
 					else:
-						self.lockedUsers.discard(messageRequest.authorId)
 						async with message.channel.typing():
 							paper = self.paperTrader.post_trade(paper, orderType, request, payload, pendingOrder)
 							if paper is None:
@@ -2603,7 +2927,7 @@ class Alpha(discord.AutoShardedClient):
 								return
 
 							if paper["globalLastReset"] == 0: paper["globalLastReset"] = int(time.time())
-							database.document("accounts/{}".format(self.account_id_for(messageRequest.authorId))).set({"paperTrader": paper}, merge=True)
+							self.accountWriter.merge(self.account_id_for(messageRequest.authorId), {"paperTrader": paper})
 
 						successMessage = "Paper {} order of {} {} on {} at {} was successfully {}.".format(orderType.replace("-", " "), pendingOrder.amountText, request.get_ticker().base, request.get_exchange().name, pendingOrder.priceText, "executed" if pendingOrder.parameters["parameters"][0] else "placed")
 						embed = discord.Embed(title=successMessage, color=constants.colors["deep purple"])
@@ -2630,31 +2954,20 @@ class Alpha(discord.AutoShardedClient):
 			elif messageRequest.accountProperties["paperTrader"]["globalLastReset"] + 604800 < time.time() or messageRequest.accountProperties["paperTrader"]["globalResetCount"] == 0:
 				embed = discord.Embed(title="Do you really want to reset your paper balance? This cannot be undone.", color=constants.colors["pink"])
 				embed.set_author(name="Alpha Paper Trader", icon_url=static_storage.icon)
-				resetBalanceMessage = sentMessages.append(await message.channel.send(embed=embed))
-				self.lockedUsers.add(messageRequest.authorId)
-
-				def confirm_order(m):
-					if m.author.id == messageRequest.authorId:
-						response = ' '.join(m.clean_content.lower().split())
-						if response.startswith(("y", "yes", "sure", "confirm", "execute")): return True
-						elif response.startswith(("n", "no", "cancel", "discard", "reject")): raise Exception()
-
-				try:
-					this = await client.wait_for('message', timeout=60.0, check=confirm_order)
-				except:
-					self.lockedUsers.discard(messageRequest.authorId)
+				resetBalanceMessage = await message.channel.send(embed=embed)
+				sentMessages.append(resetBalanceMessage)
+				if not await self.confirmations.confirm(messageRequest.authorId, message.channel.id):
 					embed = discord.Embed(title="Paper balance reset canceled.", description="~~Do you really want to reset your paper balance? This cannot be undone.~~", color=constants.colors["gray"])
 					embed.set_author(name="Alpha Paper Trader", icon_url=static_storage.icon_bw)
 					await resetBalanceMessage.edit(embed=embed)
 				else:
-					self.lockedUsers.discard(messageRequest.authorId)
 					paper = messageRequest.accountProperties["paperTrader"]
 					for exchange in supported.cryptoExchanges["Alpha Paper Trader"]:
 						paper.pop(exchange, None)
 					paper["globalResetCount"] += 1
 					paper["globalLastReset"] = int(time.time())
 
-					database.document("accounts/{}".format(self.account_id_for(messageRequest.authorId))).set({"paperTrader": paper}, merge=True)
+					self.accountWriter.merge(self.account_id_for(messageRequest.authorId), {"paperTrader": paper})
 
 					embed = discord.Embed(title="Paper balance has been reset successfully.", color=constants.colors["deep purple"])
 					embed.set_author(name="Alpha Paper Trader", icon_url=static_storage.icon)
@@ -2699,6 +3012,7 @@ def handle_exit():
 	print("\n[Shutdown]: timestamp: {}, description: closing tasks".format(Utils.get_current_date()))
 	client.loop.run_until_complete(client.topgg.close())
 	client.loop.run_until_complete(client.logout())
+	client.accountWriter.flush()
 	for t in asyncio.all_tasks(loop=client.loop):
 		if t.done():
 			try: t.exception()
@@ -2731,6 +3045,7 @@ if __name__ == "__main__":
 
 	while True:
 		client.loop.create_task(client.job_queue())
+		client.loop.create_task(client.scheduler_queue())
 		try:
 			token = os.environ["DISCORD_PRODUCTION_TOKEN" if os.environ["PRODUCTION_MODE"] else "DISCORD_DEVELOPMENT_TOKEN"]
 			client.loop.run_until_complete(client.start(token))
@@ -0,0 +1,290 @@
+import copy
+import zlib
+import pickle
+import asyncio
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+absent = object()
+
+
+def encode_fields(fields):
+	"""Packs heavy account fields, packed fields only live in memory so the format isn't versioned"""
+
+	return zlib.compress(pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+def decode_fields(packed):
+	return pickle.loads(zlib.decompress(packed))
+
+
+class UnpackedAccountCache(object):
+	"""Least recently used account records holding their heavy fields unpacked
+
+	Records evicted from the cache pack their heavy fields again, including any changes made to them in place.
+	Pinned records are in use by a handler which might still change their heavy fields in place, so they are only
+	evicted once unpinned.
+
+	Parameters
+	----------
+	capacity : int
+		maximum number of records with unpacked heavy fields
+	"""
+
+	def __init__(self, capacity=2000):
+		self.capacity = capacity
+		self.records = OrderedDict()
+		self.hits = 0
+		self.unpacks = 0
+		self.evictions = 0
+
+	def touch(self, record):
+		key = id(record)
+		if key in self.records:
+			self.records.move_to_end(key)
+			self.hits += 1
+			return
+		self.records[key] = record
+		self.unpacks += 1
+		self.shrink()
+
+	def shrink(self):
+		while len(self.records) > self.capacity:
+			key = next((key for key, record in self.records.items() if record.pins == 0), None)
+			if key is None: return
+			self.records.pop(key).pack()
+			self.evictions += 1
+
+	def discard(self, record):
+		self.records.pop(id(record), None)
+
+	def metrics(self):
+		return {
+			"unpacked": len(self.records),
+			"pinned": sum([1 for record in self.records.values() if record.pins != 0]),
+			"hits": self.hits,
+			"unpacks": self.unpacks,
+			"evictions": self.evictions
+		}
+
+
+class AccountRecord(MutableMapping):
+	"""Compact in-memory projection of an Alpha Account document
+
+	Fields read while processing every message are kept as attributes. All other fields, such as the paper trader,
+	market alerts and API keys, are kept packed and only unpacked when accessed. The record behaves like the
+	account document dictionary it replaces. Handlers holding on to heavy fields across awaits pin the record, so
+	changes made to those fields in place aren't lost when it's packed again.
+
+	Parameters
+	----------
+	accountId : str
+		id of the account document
+	properties : dict
+		account document
+	"""
+
+	__slots__ = ["accountId", "customer", "commandPresets", "settings", "oauth", "heavyKeys", "packed", "unpacked", "pins"]
+
+	hotFields = ("customer", "commandPresets", "settings", "oauth")
+	cache = UnpackedAccountCache()
+
+	def __init__(self, accountId, properties):
+		self.accountId = accountId
+		self.pins = 0
+		for field in self.hotFields:
+			setattr(self, field, properties.get(field, absent))
+		self.unpacked = {key: value for key, value in properties.items() if key not in self.hotFields}
+		self.pack()
+
+	def pack(self):
+		if self.unpacked is None: return
+		self.heavyKeys = tuple(self.unpacked)
+		self.packed = None if len(self.unpacked) == 0 else encode_fields(self.unpacked)
+		self.unpacked = None
+
+	def unpack(self):
+		if self.unpacked is None:
+			self.unpacked = {} if self.packed is None else decode_fields(self.packed)
+			self.packed = None
+		self.cache.touch(self)
+		return self.unpacked
+
+	def pin(self):
+		self.pins += 1
+
+	def unpin(self):
+		self.pins -= 1
+		if self.pins == 0: self.cache.shrink()
+
+	def __getitem__(self, key):
+		if key in self.hotFields:
+			value = getattr(self, key)
+			if value is absent: raise KeyError(key)
+			return value
+		return self.unpack()[key]
+
+	def __setitem__(self, key, value):
+		if key in self.hotFields: setattr(self, key, value)
+		else: self.unpack()[key] = value
+
+	def __delitem__(self, key):
+		if key in self.hotFields:
+			if getattr(self, key) is absent: raise KeyError(key)
+			setattr(self, key, absent)
+		else:
+			del self.unpack()[key]
+
+	def __contains__(self, key):
+		if key in self.hotFields: return getattr(self, key) is not absent
+		return key in (self.heavyKeys if self.unpacked is None else self.unpacked)
+
+	def __iter__(self):
+		for field in self.hotFields:
+			if getattr(self, field) is not absent: yield field
+		yield from (self.heavyKeys if self.unpacked is None else list(self.unpacked))
+
+	def __len__(self):
+		return sum([1 for field in self.hotFields if getattr(self, field) is not absent]) + len(self.heavyKeys if self.unpacked is None else self.unpacked)
+
+	def __copy__(self):
+		return dict(self)
+
+	def __deepcopy__(self, memo):
+		return copy.deepcopy(dict(self), memo)
+
+	def to_dict(self):
+		return dict(self)
+
+
+class ListenerGroup(object):
+	"""Accounts sharing a single database listener"""
+
+	__slots__ = ["accountIds", "watch"]
+
+	def __init__(self):
+		self.accountIds = set()
+		self.watch = None
+
+
+class AccountSubscriptions(object):
+	"""Bounded set of account documents kept up to date by shared database listeners
+
+	Accounts are subscribed to on first use and stay subscribed while they are among the `capacity` most recently
+	used ones. Instead of a listener per account, up to `groupSize` accounts share one listener on a query matching
+	their document ids, so at most `capacity / groupSize` listeners are open. A new group is only started when all
+	groups are full. Whenever the members of a group change, its listener is replaced by one matching the new
+	members, the old one is closed afterwards so no update is missed. Membership changes are serialized.
+
+	Evicted accounts are dropped from memory by the `onEvict` callback. Loading an account waits for the first
+	snapshot of its group at most `timeout` seconds. Accounts missing in that snapshot, or taking longer, are
+	considered loaded, so later requests never wait for them again.
+
+	Parameters
+	----------
+	capacity : int
+		maximum number of subscribed accounts
+	groupSize : int
+		maximum number of accounts sharing a listener, limited by the number of values Firestore accepts in an `in`
+		query
+	timeout : float
+		number of seconds to wait for the first snapshot of a newly subscribed account
+	"""
+
+	def __init__(self, capacity=1000, groupSize=10, timeout=10):
+		self.capacity = capacity
+		self.groupSize = groupSize
+		self.timeout = timeout
+		self.subscribe = None
+		self.unsubscribe = None
+		self.onEvict = None
+		self.accounts = OrderedDict()
+		self.groups = []
+		self.pending = {}
+		self.lock = None
+		self.hits = 0
+		self.loads = 0
+		self.evictions = 0
+		self.resubscriptions = 0
+		self.timeouts = 0
+
+	def is_subscribed(self, accountId):
+		return accountId in self.accounts
+
+	async def load(self, accountId):
+		"""Subscribes to an account document unless already subscribed, and waits for its first snapshot
+
+		Parameters
+		----------
+		accountId : str
+			id of the account document
+		"""
+
+		if accountId in self.accounts:
+			self.accounts.move_to_end(accountId)
+			self.hits += 1
+		elif accountId not in self.pending:
+			self.pending[accountId] = asyncio.get_event_loop().create_future()
+			self.loads += 1
+			if self.lock is None: self.lock = asyncio.Lock()
+			try:
+				async with self.lock:
+					await self.add(accountId)
+			except BaseException:
+				group = self.accounts.pop(accountId, None)
+				if group is not None: group.accountIds.discard(accountId)
+				self.loaded(accountId)
+				raise
+
+		if accountId in self.pending:
+			try:
+				await asyncio.wait_for(asyncio.shield(self.pending[accountId]), self.timeout)
+			except asyncio.TimeoutError:
+				self.timeouts += 1
+				self.loaded(accountId)
+
+	async def add(self, accountId):
+		changedGroups = []
+		while len(self.accounts) >= self.capacity:
+			evictedId, group = self.accounts.popitem(last=False)
+			group.accountIds.discard(evictedId)
+			self.loaded(evictedId)
+			self.evictions += 1
+			self.onEvict(evictedId)
+			if group not in changedGroups: changedGroups.append(group)
+
+		group = next((group for group in self.groups if len(group.accountIds) < self.groupSize), None)
+		if group is None:
+			group = ListenerGroup()
+			self.groups.append(group)
+		group.accountIds.add(accountId)
+		self.accounts[accountId] = group
+		if group not in changedGroups: changedGroups.append(group)
+
+		for group in changedGroups:
+			previousWatch = group.watch
+			if len(group.accountIds) == 0:
+				self.groups.remove(group)
+				group.watch = None
+			else:
+				group.watch = await self.subscribe(sorted(group.accountIds))
+				self.resubscriptions += 1
+			if previousWatch is not None: self.unsubscribe(previousWatch)
+
+	def loaded(self, accountId):
+		"""Marks the first snapshot of a subscribed account as applied"""
+
+		future = self.pending.pop(accountId, None)
+		if future is not None and not future.done(): future.set_result(None)
+
+	def metrics(self):
+		return {
+			"subscribed": len(self.accounts),
+			"listeners": len(self.groups),
+			"loading": len(self.pending),
+			"hits": self.hits,
+			"loads": self.loads,
+			"evictions": self.evictions,
+			"resubscriptions": self.resubscriptions,
+			"timeouts": self.timeouts
+		}
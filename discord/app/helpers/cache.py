@@ -0,0 +1,212 @@
+import time
+import asyncio
+from collections import OrderedDict
+
+
+class RequestCache(object):
+	"""Short-lived cache of data server responses with single-flight request coalescing
+
+	A response is kept for `ttl` seconds. While a request for a key is in flight, identical requests wait for its
+	response instead of being sent upstream again.
+
+	Parameters
+	----------
+	ttl : float
+		number of seconds a response is served from the cache
+	capacity : int
+		maximum number of cached responses
+	isCacheable : callable
+		decides whether a response should be cached, failed requests usually shouldn't be
+	"""
+
+	def __init__(self, ttl, capacity=10000, isCacheable=None):
+		self.ttl = ttl
+		self.capacity = capacity
+		self.isCacheable = isCacheable
+		self.entries = {}
+		self.inflight = {}
+		self.hits = 0
+		self.misses = 0
+		self.coalesced = 0
+
+	async def get(self, key, fetch):
+		"""Returns a cached response or fetches a new one
+
+		Parameters
+		----------
+		key : tuple
+			normalized request key
+		fetch : callable
+			coroutine function requesting the response from upstream
+		"""
+
+		entry = self.entries.get(key)
+		if entry is not None:
+			if entry[0] > time.time():
+				self.hits += 1
+				return entry[1]
+			self.entries.pop(key, None)
+
+		if key in self.inflight:
+			self.coalesced += 1
+			return await asyncio.shield(self.inflight[key])
+
+		self.misses += 1
+		future = asyncio.get_event_loop().create_future()
+		self.inflight[key] = future
+		try:
+			response = await fetch()
+		except asyncio.CancelledError:
+			future.cancel()
+			raise
+		except BaseException as e:
+			future.set_exception(e)
+			future.exception()
+			raise
+		else:
+			future.set_result(response)
+			if self.ttl > 0 and (self.isCacheable is None or self.isCacheable(response)): self.store(key, response)
+			return response
+		finally:
+			self.inflight.pop(key, None)
+
+	def store(self, key, response):
+		self.entries.pop(key, None)
+		self.entries[key] = (time.time() + self.ttl, response)
+		while len(self.entries) > self.capacity:
+			self.entries.pop(next(iter(self.entries)))
+
+	def clear(self):
+		self.entries.clear()
+
+	def metrics(self):
+		return {
+			"entries": len(self.entries),
+			"in flight": len(self.inflight),
+			"hits": self.hits,
+			"misses": self.misses,
+			"coalesced": self.coalesced
+		}
+
+
+class ChartCache(object):
+	"""Least recently used cache of rendered charts bounded by the total size of cached images
+
+	Parameters
+	----------
+	maxSize : int
+		maximum number of bytes of cached images
+	"""
+
+	def __init__(self, maxSize):
+		self.maxSize = maxSize
+		self.size = 0
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	parameterGroups = ("get_indicators", "get_types", "get_styles", "get_filters")
+
+	@staticmethod
+	def fingerprint(request, timeframe=None):
+		"""Canonical key of the fields of a processed request which decide what the rendered chart looks like
+
+		The key is made of the platform, exchange id, ticker id, timeframe, ids of the parameters in each parameter
+		group the request has, and its numerical parameters. Parameters are sorted, so equal requests map to the same
+		key regardless of the order they were typed in, and cached market data or other per-request state never
+		changes it.
+
+		Parameters
+		----------
+		request : object
+			processed chart, heat map or depth request
+		timeframe : str
+			timeframe the request is set to, if any
+		"""
+
+		ticker, exchange = request.get_ticker(), request.get_exchange()
+		parameters = tuple([tuple(sorted([e.id for e in getattr(request, group)()])) for group in ChartCache.parameterGroups if hasattr(request, group)])
+		return (request.currentPlatform, None if exchange is None else exchange.id, None if ticker is None else ticker.id, None if timeframe is None else str(timeframe), parameters, tuple(request.get_numerical_parameters()))
+
+	def get(self, key):
+		entry = self.entries.get(key)
+		if entry is None:
+			self.misses += 1
+			return None
+		self.entries.move_to_end(key)
+		self.hits += 1
+		return entry
+
+	def store(self, key, image, text):
+		if len(image) > self.maxSize: return
+		if key in self.entries: self.size -= len(self.entries.pop(key)[0])
+		self.entries[key] = (image, text)
+		self.size += len(image)
+		while self.size > self.maxSize:
+			_, (evictedImage, _) = self.entries.popitem(last=False)
+			self.size -= len(evictedImage)
+			self.evictions += 1
+
+	def metrics(self):
+		return {
+			"entries": len(self.entries),
+			"size": self.size,
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions
+		}
+
+
+class NegativeCache(object):
+	"""Short-lived record of requests the data server had no data for
+
+	Failed responses are answered locally for `ttl` seconds. The cache is cleared whenever a new parser index is
+	published, since tickers unknown to the previous index might have become available.
+
+	Parameters
+	----------
+	ttl : float
+		number of seconds a failed response is remembered
+	capacity : int
+		maximum number of remembered failures
+	"""
+
+	def __init__(self, ttl, capacity=10000):
+		self.ttl = ttl
+		self.capacity = capacity
+		self.entries = {}
+		self.hits = 0
+		self.invalidations = 0
+
+	def get(self, key):
+		"""Returns the remembered failed response for a key or None"""
+
+		entry = self.entries.get(key)
+		if entry is None: return None
+		if entry[0] <= time.time():
+			self.entries.pop(key, None)
+			return None
+		self.hits += 1
+		return entry[1]
+
+	def store(self, key, response):
+		if self.ttl <= 0: return
+		entries = self.entries
+		entries.pop(key, None)
+		entries[key] = (time.time() + self.ttl, response)
+		while len(entries) > self.capacity:
+			entries.pop(next(iter(entries)))
+
+	def clear(self):
+		"""Forgets all failures, safe to call from the parser index worker thread"""
+
+		self.entries = {}
+		self.invalidations += 1
+
+	def metrics(self):
+		return {
+			"entries": len(self.entries),
+			"hits": self.hits,
+			"invalidations": self.invalidations
+		}
@@ -0,0 +1,116 @@
+import re
+
+from helpers import constants
+
+
+class Command(object):
+	"""Describes how a command is parsed, rate limited and accounted for
+
+	Parameters
+	----------
+	handler : str
+		name of the Alpha method processing the command. Sliced commands are called once per request slice, raw
+		commands once with the whole message.
+	separator : str
+		regular expression splitting the request into slices, raw commands have no separator
+	platforms : dict
+		platform names keyed by three character request slice prefixes (e.g. `tv `), the handler receives the
+		selected platform as an extra argument
+	weight : int
+		rate limit weight charged per slice before it's processed, unweighted commands aren't rate limited
+	isWeightAdjusted : bool
+		whether the charged weight is corrected by the number of messages the handler sent
+	statistic : str
+		key in request statistics the request weight is added to
+	tip : str
+		command key used to pick a tip message
+	help : str
+		title of the help message sent in response to `<keyword> help`
+	isConcurrent : bool
+		whether request slices can be processed at the same time, only safe for commands which don't modify
+		account data
+	"""
+
+	__slots__ = ["handler", "separator", "platforms", "weight", "isWeightAdjusted", "statistic", "tip", "help", "helpColor", "notice", "allowsBots", "allowsDirectMessages", "restrictedTo", "isConcurrent"]
+
+	def __init__(self, handler, separator=None, platforms=None, weight=None, isWeightAdjusted=False, statistic=None, tip=None, help=None, helpColor="light blue", notice=None, allowsBots=True, allowsDirectMessages=True, restrictedTo=None, isConcurrent=False):
+		self.handler = handler
+		self.separator = None if separator is None else re.compile(separator)
+		self.platforms = platforms
+		self.weight = weight
+		self.isWeightAdjusted = isWeightAdjusted
+		self.statistic = statistic
+		self.tip = tip
+		self.help = help
+		self.helpColor = helpColor
+		self.notice = notice
+		self.allowsBots = allowsBots
+		self.allowsDirectMessages = allowsDirectMessages
+		self.restrictedTo = restrictedTo
+		self.isConcurrent = isConcurrent
+
+
+def find_command(content):
+	"""Finds a registered command by the first word of a message
+
+	Parameters
+	----------
+	content : str
+		normalized lowercase message content
+	"""
+
+	return commands.get(content.split(" ", 1)[0])
+
+def may_be_request(content, *presetLists):
+	"""Checks whether a raw message could trigger any bot action
+
+	Only the beginning of the message is inspected, so ordinary chat is rejected before the message is normalized,
+	presets are expanded and shortcuts are resolved. Anything that could be a request is let through.
+
+	Parameters
+	----------
+	content : str
+		raw message content
+	presetLists : [list]
+		command presets the message could match
+	"""
+
+	words = content[:requestHeadLength].split(None, 1)
+	if len(words) == 0: return False
+	if len(words) == 1 and len(content) > requestHeadLength: return True
+
+	keyword = words[0].lower()
+	if keyword in requestKeywords or keyword.startswith("<") or "→" in content: return True
+	for presets in presetLists:
+		for preset in presets:
+			phrase = preset["phrase"]
+			if phrase.startswith(keyword) and (len(phrase) == len(keyword) or phrase[len(keyword)] == " "): return True
+	return False
+
+
+prefixChangeNotice = (":tools: Prefix change notice", "We are changing the prefix used for market information requests from `mcap`, `mc`, and `$` to `m` and `info`. Old prefixes will no longer work starting November 1st 2020.")
+
+commands = {}
+
+commands["alpha"] = commands["alpha,"] = commands["@alpha"] = commands["@alpha,"] = Command("ask_assistant", statistic="alpha")
+commands["set"] = Command("settings_notice", allowsBots=False, allowsDirectMessages=False)
+commands["preset"] = Command("presets", separator=", preset | preset", tip="preset", help=":pushpin: Command presets", allowsBots=False)
+commands["c"] = Command("chart", separator=", c | c |, ", platforms={"am ": "Alternative.me", "wc ": "Woobull Charts", "tl ": "TradingLite", "tv ": "TradingView", "bm ": "Bookmap", "gc ": "GoCharting", "fv ": "Finviz"}, weight=2, isWeightAdjusted=True, statistic="c", tip="c", help=":chart_with_upwards_trend: Charts", isConcurrent=True)
+commands["flow"] = Command("flow", separator=", flow | flow |, ", platforms={"bb ": "Bender ProfitBox"}, weight=2, isWeightAdjusted=True, statistic="flow", tip="flow", help=":microscope: Alpha Flow", isConcurrent=True)
+commands["hmap"] = Command("heatmap", separator=", hmap | hmap |, ", platforms={"bg ": "Bitgur", "fv ": "Finviz"}, weight=2, isWeightAdjusted=True, statistic="hmap", tip="hmap", help=":fire: Heat map", isConcurrent=True)
+commands["d"] = Command("depth", separator=", d | d |, ", platforms={"cx ": "CCXT"}, weight=2, isWeightAdjusted=True, statistic="d", tip="d", help=":book: Orderbook visualizations", isConcurrent=True)
+commands["alert"] = commands["alerts"] = Command("alert", separator=", alert | alert |, alerts | alerts |, ", statistic="alerts", tip="alerts", help=":bell: Price Alerts", allowsBots=False)
+commands["p"] = Command("price", separator=", p | p |, ", platforms={"am ": "Alternative.me", "cg ": "CoinGecko", "cm ": "CCXT", "tm ": "IEXC"}, weight=2, isWeightAdjusted=True, statistic="p", tip="p", help=":money_with_wings: Prices", isConcurrent=True)
+commands["v"] = Command("volume", separator=", v | v |, ", platforms={"cg ": "CoinGecko", "cx ": "CCXT"}, weight=1, statistic="v", tip="v", help=":credit_card: Volume", isConcurrent=True)
+commands["convert"] = Command("convert", separator=", convert | convert |, ", weight=1, statistic="convert", tip="convert", help=":yen: Cryptocurrency conversions", isConcurrent=True)
+commands["m"] = commands["info"] = Command("details", separator=", m | m |, info | info |, mcap | mcap |, mc | mc |, ", weight=1, statistic="mcap", tip="mcap", help=":tools: Market information", isConcurrent=True)
+commands["mcap"] = commands["mc"] = Command("details", separator=", m | m |, info | info |, mcap | mcap |, mc | mc |, ", weight=1, statistic="mcap", tip="mcap", help=":tools: Market information", notice=prefixChangeNotice, isConcurrent=True)
+commands["t"] = commands["top"] = Command("rankings", separator=", t | t |, top | top |, ", weight=1, statistic="t", tip="mcap", help=":tools: Rankings", isConcurrent=True)
+commands["mk"] = Command("markets", separator=", mk | mk |, ", weight=1, statistic="mk", tip="mk", help=":page_facing_up: Market listings", isConcurrent=True)
+commands["n"] = Command("news", separator=", n | n |, ", weight=1, statistic="n", tip="n", help=":newspaper: News", helpColor="gray", restrictedTo=constants.administrators, isConcurrent=True)
+commands["stream"] = Command("data_stream", separator=", stream | stream |, ", statistic="alerts", tip="alerts", help=":abacus: Data Streams", allowsBots=False, restrictedTo=constants.administrators)
+commands["x"] = Command("live_trading", separator=", x | x |, ", statistic="x", tip="x", help=":dart: Alpha Live Trader", restrictedTo={361916376069439490})
+commands["paper"] = Command("paper_trading", separator=", paper | paper |, ", statistic="paper", tip="paper", help=":joystick: Alpha Paper Trader")
+
+requestHeadLength = 32
+requestKeywords = frozenset(constants.commandKeywords) | constants.shortcutKeywords | {"a", "brekkeven"} | {phrase.split(" ", 1)[0].lower() for phrases in constants.funnyReplies.values() for phrase in phrases}
@@ -0,0 +1,94 @@
+import asyncio
+
+from helpers.ratelimiter import TimingWheel
+
+
+class ConfirmationRegistry(object):
+	"""Pending yes or no confirmations keyed by user and channel
+
+	Incoming messages are matched against pending confirmations with a single lookup instead of every pending
+	confirmation checking every received message. While a confirmation is pending, messages the user sends in the
+	same channel are consumed by it. Timeouts are kept in a timing wheel advanced by the scheduler task.
+
+	Parameters
+	----------
+	timeout : int
+		number of seconds a confirmation waits for a response
+	"""
+
+	acceptingResponses = ("y", "yes", "sure", "confirm", "execute")
+	rejectingResponses = ("n", "no", "cancel", "discard", "reject")
+
+	def __init__(self, timeout=60):
+		self.timeout = timeout
+		self.pending = {}
+		self.wheel = TimingWheel(timeout + 1)
+		self.confirmed = 0
+		self.rejected = 0
+		self.expired = 0
+
+	async def confirm(self, authorId, channelId):
+		"""Waits for the user to confirm or reject a pending action
+
+		Returns True if the action was confirmed, False if it was rejected, superseded or timed out.
+
+		Parameters
+		----------
+		authorId : int
+			id of the user asked for confirmation
+		channelId : int
+			id of the channel the confirmation was requested in
+		"""
+
+		key = (authorId, channelId)
+		if key in self.pending and not self.pending[key].done(): self.pending[key].set_result(False)
+		future = asyncio.get_event_loop().create_future()
+		self.pending[key] = future
+		self.wheel.schedule(self.timeout, (key, future))
+		return await future
+
+	def resolve(self, authorId, channelId, content):
+		"""Passes a received message to a pending confirmation
+
+		Returns True if the message was consumed by a pending confirmation.
+
+		Parameters
+		----------
+		authorId : int
+			id of the message author
+		channelId : int
+			id of the channel the message was sent in
+		content : str
+			message content
+		"""
+
+		future = self.pending.get((authorId, channelId))
+		if future is None: return False
+
+		response = " ".join(content.lower().split())
+		if response.startswith(self.acceptingResponses):
+			self.pending.pop((authorId, channelId))
+			if not future.done(): future.set_result(True)
+			self.confirmed += 1
+		elif response.startswith(self.rejectingResponses):
+			self.pending.pop((authorId, channelId))
+			if not future.done(): future.set_result(False)
+			self.rejected += 1
+		return True
+
+	def tick(self):
+		"""Advances the timeout wheel by one second and cancels expired confirmations"""
+
+		for key, future in self.wheel.advance():
+			if self.pending.get(key) is future: self.pending.pop(key)
+			if not future.done():
+				future.set_result(False)
+				self.expired += 1
+
+	def metrics(self):
+		return {
+			"pending": len(self.pending),
+			"confirmed": self.confirmed,
+			"rejected": self.rejected,
+			"expired": self.expired
+		}
@@ -1,6 +1,52 @@
 commandWakephrases = ["set ", "alpha ", "alert ", "preset ", "c ", "flow ", "hmap ", "d ", "alerts ", "p ", "v ", "convert ", "m ", "info ", "t ", "top ", "mcap ", "mc ", "mk ", "n ", "x ", "paper "]
 commandKeywords = ["set", "alpha", "alert", "preset", "c", "flow", "hmap", "d", "alerts", "p", "v", "convert", "m", "info", "t", "top", "mcap", "mc", "mk", "n", "x", "paper"]
 
+# Shortcuts, deprecated shortcuts are only resolved when enabled in guild settings
+deprecatedShortcuts = {
+	"p xbt, eth mex, xrp mex": ["mex"],
+	"p futures": ["fut", "futs", "futures"],
+	"p xbt fun, eth fun, xrp fun": ["funding", "fun"],
+	"p xbt oi, eth oi, xrp oi": ["oi", "ov"],
+	"p xbt": ["mex xbt", "mex btc"],
+	"p eth mex": ["mex eth"],
+	"p xrp mex": ["mex xrp"],
+	"p bch mex": ["mex bch"],
+	"p ltc mex": ["mex ltc"],
+	"p link mex": ["mex link"],
+	"p eos mex": ["mex eos"],
+	"p trx mex": ["mex trx"],
+	"p ada mex": ["mex ada"],
+	"p btc prems": ["prem", "prems", "premiums"],
+	"p xbt funding": ["funding xbt", "fun xbt", "funding xbtusd", "fun xbtusd", "funding btc", "fun btc", "funding btcusd", "fun btcusd", "xbt funding", "xbt fun", "xbtusd funding", "xbtusd fun", "btc funding", "btc fun", "btcusd funding", "btcusd fun"],
+	"p eth funding": ["funding eth", "fun eth", "funding ethusd", "fun ethusd", "eth funding", "eth fun", "ethusd funding", "ethusd fun"],
+	"p xrp funding": ["funding xrp", "fun xrp", "funding xrpusd", "fun xrpusd", "xrp funding", "xrp fun", "xrpusd funding", "xrpusd fun"],
+	"p bch funding": ["funding bch", "fun bch", "funding bchusd", "fun bchusd", "bch funding", "bch fun", "bchusd funding", "bchusd fun"],
+	"p ltc funding": ["funding ltc", "fun ltc", "funding ltcusd", "fun ltcusd", "ltc funding", "ltc fun", "ltcusd funding", "ltcusd fun"],
+	"p link funding": ["funding link", "fun link", "funding linkusd", "fun linkusd", "link funding", "link fun", "linkusd funding", "linkusd fun"],
+	"p xbt oi": ["oi xbt", "oi xbtusd", "ov xbt", "ov xbtusd"],
+	"p eth oi": ["oi eth", "oi ethusd", "ov eth", "ov ethusd"],
+	"p xrp oi": ["oi xrp", "oi xrpusd", "ov xrp", "ov xrpusd"],
+	"p bch oi": ["oi bch", "oi bchusd", "ov bch", "ov bchusd"],
+	"p ltc oi": ["oi ltc", "oi ltcusd", "ov ltc", "ov ltcusd"],
+	"p link oi": ["oi link", "oi linkusd", "ov link", "ov linkusd"],
+}
+shortcuts = {
+	"alpha help": ["!help", "?help"],
+	"alpha invite": ["!invite", "?invite"],
+	"c uvol-dvol w, tick, dvn-decn, pcc d line": ["c internals", "c internal"],
+	"c bvol": ["c btc vol"],
+	"c total nv": ["c mcap"],
+	"c total2 nv": ["c alt mcap"],
+	"hmap change": ["hmap"],
+	"flow options": ["flow"],
+	"p am fgi": ["p gindex", "p gi", "p findex", "p fi", "p fgindex", "p fgi", "p gfindex", "p gfi"],
+	"c am fgi": ["c gindex", "c gi", "c findex", "c fi", "c fgindex", "c fgi", "c gfindex", "c gfi"],
+	"c wc nvt": ["c nvtr", "c nvt", "c nvt ratio", "c nvtratio"],
+	"c wc drbn": ["c drbns", "c drbn", "c rbns", "c rbn", "c dribbon", "c difficultyribbon"],
+	"p xbtz20, xbth21": ["p fut", "p futs", "p futures"],
+}
+shortcutKeywords = {alias.split(" ", 1)[0] for aliases in list(deprecatedShortcuts.values()) + list(shortcuts.values()) for alias in aliases}
+
 colors = {
 	"red": 0xF44336,
 	"pink": 0xE91E63,
@@ -98,6 +144,9 @@ badPunTrigger = [
 ]
 
 # Users
+administrators = {
+	361916376069439490, 164073578696802305, 390170634891689984
+}
 blockedUsers = {
 	211986377171140609, 464581380467064832, 195802900797194245
 }
@@ -0,0 +1,103 @@
+import asyncio
+import traceback
+import concurrent.futures
+
+
+class AsyncDatabase(object):
+	"""Firestore access for coroutines
+
+	Blocking Firestore calls are run on a dedicated I/O executor, so slow database round-trips never stall the
+	event loop, nor wait for executor threads busy with unrelated work.
+
+	Parameters
+	----------
+	database : google.cloud.firestore.Client
+		Firestore client
+	workers : int
+		number of threads reserved for database calls
+	"""
+
+	def __init__(self, database, workers=8):
+		self.database = database
+		self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="firestore")
+
+	async def run(self, function, *args, **kwargs):
+		return await asyncio.get_event_loop().run_in_executor(self.executor, lambda: function(*args, **kwargs))
+
+	async def get(self, path):
+		"""Returns a document as a dictionary, None if it doesn't exist"""
+
+		return await self.run(lambda: self.database.document(path).get().to_dict())
+
+	async def set(self, path, data, merge=False):
+		await self.run(self.database.document(path).set, data, merge=merge)
+
+	async def delete(self, path):
+		await self.run(self.database.document(path).delete)
+
+
+class LoopGuard(object):
+	"""Firestore client proxy flagging blocking database calls made from a running event loop
+
+	Document and collection references obtained through the guard check whether they are used from a thread
+	running an event loop before every blocking call. Every offending call site is reported once, with the stack
+	leading to it. In strict mode such calls raise instead.
+
+	Parameters
+	----------
+	client : google.cloud.firestore.Client
+		Firestore client
+	strict : bool
+		whether blocking calls from the event loop raise a RuntimeError
+	"""
+
+	blockingMethods = frozenset(["get", "set", "update", "delete", "create", "stream", "list_documents", "on_snapshot"])
+	referenceMethods = frozenset(["document", "collection", "where", "order_by", "limit", "offset", "start_at", "start_after", "end_at", "end_before", "select"])
+
+	def __init__(self, client, strict=False):
+		self.client = client
+		self.strict = strict
+		self.violations = {}
+
+	def document(self, *args, **kwargs):
+		return GuardedReference(self.client.document(*args, **kwargs), self)
+
+	def collection(self, *args, **kwargs):
+		return GuardedReference(self.client.collection(*args, **kwargs), self)
+
+	def __getattr__(self, name):
+		return getattr(self.client, name)
+
+	def check(self, name):
+		try: asyncio.get_running_loop()
+		except RuntimeError: return
+
+		stack = traceback.extract_stack()[:-2]
+		site = "{}:{}".format(stack[-1].filename, stack[-1].lineno)
+		if self.strict: raise RuntimeError("blocking Firestore {}() called from the event loop at {}".format(name, site))
+		if site not in self.violations:
+			self.violations[site] = 0
+			print("[Loop guard]: blocking Firestore {}() called from the event loop\n{}".format(name, "".join(traceback.format_list(stack[-3:]))))
+		self.violations[site] += 1
+
+	def metrics(self):
+		return dict(self.violations)
+
+
+class GuardedReference(object):
+	"""Firestore reference or query proxy checking blocking calls with the loop guard"""
+
+	def __init__(self, reference, guard):
+		self.reference = reference
+		self.guard = guard
+
+	def __getattr__(self, name):
+		attribute = getattr(self.reference, name)
+		if name in LoopGuard.blockingMethods:
+			def blocking_call(*args, **kwargs):
+				self.guard.check(name)
+				return attribute(*args, **kwargs)
+			return blocking_call
+		elif name in LoopGuard.referenceMethods:
+			return lambda *args, **kwargs: GuardedReference(attribute(*args, **kwargs), self.guard)
+		return attribute
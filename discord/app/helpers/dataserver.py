@@ -0,0 +1,91 @@
+import time
+import asyncio
+from collections import deque, defaultdict
+
+
+class LatencyTracker(object):
+	"""Latencies of the most recent successful requests to a data server endpoint
+
+	Parameters
+	----------
+	samples : int
+		number of latencies kept
+	"""
+
+	def __init__(self, samples=256):
+		self.latencies = deque(maxlen=samples)
+
+	def record(self, latency):
+		self.latencies.append(latency)
+
+	def percentile(self, percentile):
+		if len(self.latencies) == 0: return None
+		ordered = sorted(self.latencies)
+		return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+class RequestDeadlines(object):
+	"""Deadlines of data server requests keyed by endpoint
+
+	A request is cancelled once its deadline passes. Latencies of requests which finished in time and the number of
+	requests which didn't are tracked per endpoint.
+
+	Parameters
+	----------
+	deadlines : dict
+		number of seconds to wait for a response keyed by endpoint
+	timeout : float
+		number of seconds to wait for a response from endpoints without a deadline
+	busyThreshold : int
+		number of requests in flight at which the data server is considered busy, zero disables the check
+	"""
+
+	def __init__(self, deadlines, timeout=60, busyThreshold=0):
+		self.deadlines = deadlines
+		self.timeout = timeout
+		self.busyThreshold = busyThreshold
+		self.inflight = 0
+		self.requests = defaultdict(int)
+		self.timeouts = defaultdict(int)
+		self.latencies = defaultdict(LatencyTracker)
+
+	def deadline(self, endpoint):
+		return self.deadlines.get(endpoint, self.timeout)
+
+	def is_busy(self):
+		"""Checks whether at least `busyThreshold` requests are waiting for the data server"""
+
+		return self.busyThreshold > 0 and self.inflight >= self.busyThreshold
+
+	async def run(self, endpoint, awaitable):
+		"""Waits for a data server request, raises asyncio.TimeoutError when it didn't finish before its deadline
+
+		Parameters
+		----------
+		endpoint : str
+			data server endpoint
+		awaitable : awaitable
+			request to wait for, cancelled once the deadline passes
+		"""
+
+		self.requests[endpoint] += 1
+		self.inflight += 1
+		start = time.monotonic()
+		try:
+			response = await asyncio.wait_for(awaitable, self.deadline(endpoint))
+		except asyncio.TimeoutError:
+			self.timeouts[endpoint] += 1
+			raise
+		finally:
+			self.inflight -= 1
+		self.latencies[endpoint].record(time.monotonic() - start)
+		return response
+
+	def metrics(self):
+		return {
+			"in flight": self.inflight,
+			"requests": dict(self.requests),
+			"timeouts": dict(self.timeouts),
+			"p95 latency": {endpoint: latencies.percentile(95) for endpoint, latencies in self.latencies.items()}
+		}
+
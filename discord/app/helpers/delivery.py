@@ -0,0 +1,43 @@
+class OrderedChannel(object):
+	"""Channel proxy delaying sent messages until the preceding request slice has been delivered
+
+	Parameters
+	----------
+	channel : discord.abc.Messageable
+		channel the request was received in
+	turn : asyncio.Event
+		event set once the preceding request slice finished
+	"""
+
+	def __init__(self, channel, turn):
+		self._channel = channel
+		self._turn = turn
+
+	def __getattr__(self, name):
+		return getattr(self._channel, name)
+
+	async def send(self, *args, **kwargs):
+		await self._turn.wait()
+		return await self._channel.send(*args, **kwargs)
+
+
+class OrderedMessage(object):
+	"""Message proxy handed to concurrently processed request slices
+
+	Everything but the channel is forwarded to the original message, replies sent through the channel are held
+	back until all preceding slices are delivered, so they appear in the order the request was typed.
+
+	Parameters
+	----------
+	message : discord.Message
+		message the request was received in
+	turn : asyncio.Event
+		event set once the preceding request slice finished
+	"""
+
+	def __init__(self, message, turn):
+		self._message = message
+		self.channel = OrderedChannel(message.channel, turn)
+
+	def __getattr__(self, name):
+		return getattr(self._message, name)
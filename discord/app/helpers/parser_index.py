@@ -0,0 +1,158 @@
+import os
+import io
+import mmap
+import time
+import zlib
+import struct
+import pickle
+
+try:
+	import zstandard
+except ImportError:
+	zstandard = None
+
+
+class ParserIndexCodec(object):
+	"""Encodes and decodes parser index sections
+
+	Encoded sections start with a magic prefix and a version byte selecting the codec. Blobs without the prefix
+	are zlib-compressed pickles, the format used before codecs were versioned.
+
+	Versions
+	--------
+	1 : pickle compressed with zlib
+	2 : pickle compressed with zstandard, unpickled straight from the decompression stream so the decompressed
+		buffer is never held in memory as a whole
+	"""
+
+	magic = b"AIC"
+	codecs = {}
+
+	@staticmethod
+	def register(version, encoder, decoder):
+		ParserIndexCodec.codecs[version] = (encoder, decoder)
+
+	@staticmethod
+	def preferred_version():
+		return max(ParserIndexCodec.codecs)
+
+	@staticmethod
+	def encode(section, version=None):
+		"""Encodes an index section
+
+		Parameters
+		----------
+		section : dict
+			decoded index section
+		version : int
+			codec version, defaults to the preferred available codec
+		"""
+
+		if version is None: version = ParserIndexCodec.preferred_version()
+		if version not in ParserIndexCodec.codecs: raise ValueError("parser index codec version {} is not available".format(version))
+		return ParserIndexCodec.magic + bytes([version]) + ParserIndexCodec.codecs[version][0](section)
+
+	@staticmethod
+	def decode(blob):
+		"""Decodes an index section encoded with any known codec version
+
+		Parameters
+		----------
+		blob : bytes-like
+			encoded index section
+		"""
+
+		blob = memoryview(blob)
+		if bytes(blob[:len(ParserIndexCodec.magic)]) != ParserIndexCodec.magic:
+			return pickle.loads(zlib.decompress(blob))
+
+		version = blob[len(ParserIndexCodec.magic)]
+		if version not in ParserIndexCodec.codecs: raise ValueError("parser index codec version {} is not available".format(version))
+		return ParserIndexCodec.codecs[version][1](blob[len(ParserIndexCodec.magic) + 1:])
+
+
+ParserIndexCodec.register(1, lambda section: zlib.compress(pickle.dumps(section, protocol=pickle.HIGHEST_PROTOCOL)), lambda payload: pickle.loads(zlib.decompress(payload)))
+if zstandard is not None:
+	ParserIndexCodec.register(2, lambda section: zstandard.ZstdCompressor(level=6).compress(pickle.dumps(section, protocol=pickle.HIGHEST_PROTOCOL)), lambda payload: pickle.load(zstandard.ZstdDecompressor().stream_reader(payload)))
+
+
+class ParserIndexSnapshot(object):
+	"""Local copy of the last good parser index received from the data server
+
+	The file stores the compressed index blobs exactly as they were received, so a restarted bot can serve ticker
+	lookups before the first `dataserver/parserIndex` snapshot arrives. Blobs are read from a memory-mapped file
+	and are only decoded by the caller.
+
+	Layout: magic, format version, creation timestamp, section count, section table (name, offset, length), blobs.
+	"""
+
+	magic = b"APIX"
+	formatVersion = 1
+	sections = ["CCXT", "CoinGecko", "IEXC Stocks", "IEXC Forex"]
+
+	_header = struct.Struct("<4sHdI")
+	_section = struct.Struct("<H")
+	_location = struct.Struct("<QQ")
+
+	def __init__(self, path):
+		self.path = path
+
+	def save(self, blobs):
+		"""Atomically replaces the local snapshot with new index blobs
+
+		Parameters
+		----------
+		blobs : dict
+			compressed index blobs keyed by section name
+		"""
+
+		names = [name for name in self.sections if name in blobs]
+		table = io.BytesIO()
+		tableSize = sum([self._section.size + len(name.encode()) + self._location.size for name in names])
+		offset = self._header.size + tableSize
+		for name in names:
+			encodedName = name.encode()
+			table.write(self._section.pack(len(encodedName)) + encodedName)
+			table.write(self._location.pack(offset, len(blobs[name])))
+			offset += len(blobs[name])
+
+		os.makedirs(os.path.dirname(self.path), exist_ok=True)
+		temporaryPath = "{}.{}.tmp".format(self.path, os.getpid())
+		with open(temporaryPath, "wb") as file:
+			file.write(self._header.pack(self.magic, self.formatVersion, time.time(), len(names)))
+			file.write(table.getvalue())
+			for name in names:
+				file.write(blobs[name])
+			file.flush()
+			os.fsync(file.fileno())
+		os.replace(temporaryPath, self.path)
+
+	def load(self):
+		"""Reads index blobs from the local snapshot
+
+		Returns a tuple of blobs keyed by section name and snapshot creation timestamp, or (None, None) if the
+		snapshot is missing or was written in an incompatible format.
+		"""
+
+		if not os.path.isfile(self.path) or os.path.getsize(self.path) < self._header.size: return None, None
+
+		with open(self.path, "rb") as file:
+			mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+		view = memoryview(mapped)
+		magic, formatVersion, timestamp, count = self._header.unpack_from(view, 0)
+		if magic != self.magic or formatVersion != self.formatVersion: return None, None
+
+		blobs = {}
+		position = self._header.size
+		for _ in range(count):
+			(nameLength,) = self._section.unpack_from(view, position)
+			position += self._section.size
+			name = bytes(view[position:position + nameLength]).decode()
+			position += nameLength
+			offset, length = self._location.unpack_from(view, position)
+			position += self._location.size
+			if offset + length > len(view): return None, None
+			blobs[name] = view[offset:offset + length]
+
+		return blobs, timestamp
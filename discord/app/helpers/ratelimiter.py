@@ -0,0 +1,103 @@
+import time
+from collections import deque
+
+
+class TimingWheel(object):
+	"""Fixed ring of one second slots holding entries until they expire
+
+	Parameters
+	----------
+	slots : int
+		number of slots, entries can be scheduled at most `slots - 1` seconds ahead
+	"""
+
+	def __init__(self, slots):
+		self.slots = [[] for _ in range(slots)]
+		self.cursor = 0
+		self.size = 0
+
+	def schedule(self, delay, entry):
+		delay = min(max(int(delay), 1), len(self.slots) - 1)
+		self.slots[(self.cursor + delay) % len(self.slots)].append(entry)
+		self.size += 1
+
+	def advance(self):
+		"""Moves the wheel by one second and returns entries which expired"""
+
+		self.cursor = (self.cursor + 1) % len(self.slots)
+		expired, self.slots[self.cursor] = self.slots[self.cursor], []
+		self.size -= len(expired)
+		return expired
+
+
+class RateLimiter(object):
+	"""Sliding window request weight limiter backed by a single timing wheel
+
+	Weight charged for a request is released `window` seconds after the request finished. Instead of a sleeping
+	coroutine per request, releases are kept in a timing wheel advanced by one scheduler task, which also receives
+	message cleanup of expired requests in bounded batches.
+
+	Parameters
+	----------
+	window : int
+		number of seconds request weight is held for
+	cleanupBatchSize : int
+		maximum number of requests cleaned up per tick
+	"""
+
+	def __init__(self, window=60, cleanupBatchSize=100):
+		self.window = window
+		self.cleanupBatchSize = cleanupBatchSize
+		self.weights = {}
+		self.wheel = TimingWheel(window + 1)
+		self.cleanupQueue = deque()
+		self.lastTick = time.monotonic()
+		self.released = 0
+		self.cleanedUp = 0
+
+	def schedule_release(self, authorId, weight, cleanup=None):
+		"""Schedules charged request weight to be released after the window passes
+
+		Parameters
+		----------
+		authorId : int
+			id of the user the weight was charged to
+		weight : int
+			charged weight
+		cleanup : tuple
+			message cleanup to run once the weight is released
+		"""
+
+		self.wheel.schedule(self.window, (authorId, weight, cleanup))
+
+	def tick(self):
+		"""Advances the wheel to the current time and releases expired weight
+
+		Returns the next batch of pending message cleanups.
+		"""
+
+		now = time.monotonic()
+		while now - self.lastTick >= 1:
+			self.lastTick += 1
+			for authorId, weight, cleanup in self.wheel.advance():
+				if authorId in self.weights:
+					self.weights[authorId] -= weight
+					if self.weights[authorId] < 1: self.weights.pop(authorId, None)
+				if cleanup is not None: self.cleanupQueue.append(cleanup)
+				self.released += 1
+
+		batch = []
+		while len(self.cleanupQueue) != 0 and len(batch) < self.cleanupBatchSize:
+			batch.append(self.cleanupQueue.popleft())
+		self.cleanedUp += len(batch)
+		return batch
+
+	def metrics(self):
+		return {
+			"limited users": len(self.weights),
+			"charged weight": sum(self.weights.values()),
+			"pending releases": self.wheel.size,
+			"pending cleanups": len(self.cleanupQueue),
+			"released": self.released,
+			"cleaned up": self.cleanedUp
+		}
@@ -0,0 +1,37 @@
+class SentMessageRegistry(object):
+	"""Bounded registry of messages Alpha sent and reacted to
+
+	Entries are kept for the most recently sent messages only, older ones are evicted in the order they were
+	registered. Each entry holds the id of the user who requested the message, the kind of the message (`chart`,
+	`quote`, `alert`, `paper order` or `preset`) and the id of the object the message represents.
+
+	Parameters
+	----------
+	capacity : int
+		maximum number of registered messages
+	"""
+
+	def __init__(self, capacity=50000):
+		self.capacity = capacity
+		self.messages = {}
+		self.hits = 0
+		self.misses = 0
+
+	def register(self, messageId, ownerId, kind, payloadId=None):
+		self.messages.pop(messageId, None)
+		self.messages[messageId] = (ownerId, kind, payloadId)
+		if len(self.messages) > self.capacity:
+			self.messages.pop(next(iter(self.messages)))
+
+	def get(self, messageId):
+		entry = self.messages.get(messageId)
+		if entry is None: self.misses += 1
+		else: self.hits += 1
+		return entry
+
+	def metrics(self):
+		return {
+			"registered": len(self.messages),
+			"hits": self.hits,
+			"misses": self.misses
+		}
@@ -0,0 +1,80 @@
+import heapq
+import random
+
+
+class HeavyHitters(object):
+	"""Approximate counts of the most frequent keys in fixed memory
+
+	Every key is counted in a count-min sketch of `depth` rows with `width` counters each, which never
+	underestimates a count. The `k` keys with the highest estimates are kept in a min heap, so the least frequent
+	of them is replaced as soon as another key overtakes it. Rows use independent universal hash functions. Counts are halved on every decay, which lets recent
+	request storms surface over long running totals.
+
+	Parameters
+	----------
+	k : int
+		number of most frequent keys kept
+	width : int
+		number of counters per sketch row
+	depth : int
+		number of sketch rows
+	"""
+
+	prime = (1 << 61) - 1
+
+	def __init__(self, k=20, width=2048, depth=4):
+		self.k = k
+		self.width = width
+		self.depth = depth
+		self.rows = [[0] * width for _ in range(depth)]
+		self.seeds = [(random.randrange(1, self.prime), random.randrange(0, self.prime)) for _ in range(depth)]
+		self.top = {}
+		self.heap = []
+		self.total = 0
+
+	def columns(self, key):
+		keyHash = hash(key) & 0xFFFFFFFFFFFFFFFF
+		return [(a * keyHash + b) % self.prime % self.width for a, b in self.seeds]
+
+	def add(self, key, count=1):
+		estimate = None
+		for counters, column in zip(self.rows, self.columns(key)):
+			counters[column] += count
+			estimate = counters[column] if estimate is None else min(estimate, counters[column])
+		self.total += count
+
+		if key in self.top:
+			self.top[key] = estimate
+		elif len(self.top) < self.k:
+			self.top[key] = estimate
+			heapq.heappush(self.heap, (estimate, key))
+		else:
+			while self.heap[0][0] != self.top[self.heap[0][1]]:
+				heapq.heapreplace(self.heap, (self.top[self.heap[0][1]], self.heap[0][1]))
+			if estimate > self.heap[0][0]:
+				_, evictedKey = heapq.heapreplace(self.heap, (estimate, key))
+				self.top.pop(evictedKey)
+				self.top[key] = estimate
+
+	def estimate(self, key):
+		return min([counters[column] for counters, column in zip(self.rows, self.columns(key))])
+
+	def most_common(self, n=None):
+		return sorted(self.top.items(), key=lambda entry: entry[1], reverse=True)[:n]
+
+	def decay(self):
+		"""Halves all counts"""
+
+		for counters in self.rows:
+			for column in range(self.width):
+				counters[column] >>= 1
+		self.top = {key: estimate >> 1 for key, estimate in self.top.items()}
+		self.heap = [(estimate, key) for key, estimate in self.top.items()]
+		heapq.heapify(self.heap)
+		self.total >>= 1
+
+	def metrics(self, n=10):
+		return {
+			"total": self.total,
+			"top": self.most_common(n)
+		}
@@ -0,0 +1,91 @@
+import time
+import threading
+import traceback
+from collections import deque
+
+
+class SnapshotQueue(object):
+	"""Database snapshot changes received on watch threads, applied on the event loop in bounded batches
+
+	Changes are applied in the order they were received, at most `batchSize` of them per event loop iteration, so
+	a large snapshot doesn't hold up message processing. Every change is applied in one go, but a snapshot with more
+	than `batchSize` changes is spread over several loop iterations, so handlers can see it partially applied. Each
+	applied change bumps the version of the entity it belongs to, which lets derived caches check whether they are
+	still up to date with a single lookup.
+
+	Parameters
+	----------
+	batchSize : int
+		maximum number of changes applied per event loop iteration
+	"""
+
+	def __init__(self, batchSize=500):
+		self.batchSize = batchSize
+		self.loop = None
+		self.onError = None
+		self.changes = deque()
+		self.lock = threading.Lock()
+		self.isScheduled = False
+		self.versions = {}
+		self.lags = deque(maxlen=1024)
+		self.applied = 0
+		self.batches = 0
+
+	def bind(self, loop):
+		self.loop = loop
+
+	def put(self, key, apply, *args):
+		"""Queues a change to be applied on the event loop, safe to call from any thread
+
+		Parameters
+		----------
+		key : tuple
+			entity the change belongs to, e.g. `("account", accountId)`
+		apply : callable
+			function applying the change
+		args : list
+			arguments passed to the function
+		"""
+
+		with self.lock:
+			self.changes.append((time.monotonic(), key, apply, args))
+			if self.isScheduled: return
+			self.isScheduled = True
+		self.loop.call_soon_threadsafe(self.drain)
+
+	def drain(self):
+		with self.lock:
+			batch = [self.changes.popleft() for _ in range(min(self.batchSize, len(self.changes)))]
+
+		for received, key, apply, args in batch:
+			try:
+				apply(*args)
+			except Exception:
+				print(traceback.format_exc())
+				if self.onError is not None: self.onError()
+			self.versions[key] = self.versions.get(key, 0) + 1
+			self.lags.append(time.monotonic() - received)
+		self.applied += len(batch)
+		self.batches += 1
+
+		with self.lock:
+			if len(self.changes) == 0:
+				self.isScheduled = False
+				return
+		self.loop.call_soon(self.drain)
+
+	def version(self, key):
+		"""Returns the number of changes applied to an entity so far"""
+
+		return self.versions.get(key, 0)
+
+	def metrics(self):
+		lags = sorted(self.lags)
+		return {
+			"pending": len(self.changes),
+			"applied": self.applied,
+			"batches": self.batches,
+			"p50 lag": lags[len(lags) // 2] if len(lags) != 0 else None,
+			"p99 lag": lags[int(len(lags) * 0.99)] if len(lags) != 0 else None,
+			"max lag": lags[-1] if len(lags) != 0 else None
+		}
@@ -0,0 +1,57 @@
+import time
+import asyncio
+
+
+class StartupPhases(object):
+	"""Runs independent startup phases concurrently and records their durations
+
+	Parameters
+	----------
+	executor : concurrent.futures.Executor
+		executor used to run blocking startup phases
+	"""
+
+	def __init__(self, executor):
+		self.executor = executor
+		self.phases = {}
+		self.required = []
+		self.durations = {}
+		self.initiated = time.time()
+
+	def start(self, name, function, *args, required=False):
+		"""Schedules a startup phase in the background
+
+		Parameters
+		----------
+		name : str
+			phase name used in logs and when waiting on the phase
+		function : callable
+			blocking function executing the phase
+		required : bool
+			whether the bot has to wait for the phase before processing requests
+		"""
+
+		self.phases[name] = self.executor.submit(self._run, name, function, *args)
+		if required: self.required.append(name)
+		return self.phases[name]
+
+	def _run(self, name, function, *args):
+		start = time.time()
+		try:
+			return function(*args)
+		finally:
+			self.durations[name] = time.time() - start
+			print("[Startup]: {} phase finished in {:.2f} seconds".format(name, self.durations[name]))
+
+	async def wait(self, *names):
+		"""Waits for selected phases without blocking the event loop
+
+		Exceptions raised by a phase are propagated to the caller.
+		"""
+
+		for name in names:
+			if name in self.phases:
+				await asyncio.wrap_future(self.phases[name])
+
+	def summary(self):
+		return ", ".join(["{} {:.2f} s".format(name, duration) for name, duration in sorted(self.durations.items(), key=lambda e: e[1], reverse=True)])
@@ -0,0 +1,158 @@
+import time
+import copy
+import threading
+import traceback
+
+
+def merge_changes(document, changes):
+	"""Applies changes on top of pending document changes the way a merging Firestore set would
+
+	Parameters
+	----------
+	document : dict
+		pending changes, updated in place
+	changes : dict
+		newer changes
+	"""
+
+	for key, value in changes.items():
+		if isinstance(value, dict) and isinstance(document.get(key), dict): merge_changes(document[key], value)
+		else: document[key] = value
+	return document
+
+
+class AccountWriter(object):
+	"""Write-behind queue merging account changes into batched Firestore writes
+
+	Changes are queued without blocking the caller. Changes to the same account made within `window` seconds are
+	merged into a single write, pending writes are committed by a background thread in Firestore batches. A batch
+	which keeps failing is put back in front of any newer changes to the same accounts, so writes are never
+	applied out of order. Changes which weren't committed yet can be read back, so database snapshots taken before
+	the write landed don't roll back local state.
+
+	Parameters
+	----------
+	database : google.cloud.firestore.Client
+		Firestore client
+	window : float
+		number of seconds changes are collected for before they are written
+	batchSize : int
+		maximum number of writes per batch, Firestore allows up to 500
+	retries : int
+		number of attempts to commit a batch before it's rescheduled
+	"""
+
+	def __init__(self, database, window=1, batchSize=500, retries=5):
+		self.database = database
+		self.window = window
+		self.batchSize = batchSize
+		self.retries = retries
+		self.onError = None
+		self.pending = {}
+		self.writing = {}
+		self.condition = threading.Condition()
+		self.writeLock = threading.Lock()
+		self.thread = None
+		self.queued = 0
+		self.coalesced = 0
+		self.written = 0
+		self.batches = 0
+		self.retried = 0
+
+	def merge(self, accountId, changes):
+		"""Queues changes to an account document, equivalent to a merging set
+
+		Parameters
+		----------
+		accountId : str
+			id of the account document
+		changes : dict
+			changed account fields
+		"""
+
+		path = "accounts/{}".format(accountId)
+		changes = copy.deepcopy(changes)
+		with self.condition:
+			if path in self.pending:
+				merge_changes(self.pending[path], changes)
+				self.coalesced += 1
+			else:
+				self.pending[path] = changes
+			self.queued += 1
+			if self.thread is None:
+				self.thread = threading.Thread(target=self.run, daemon=True)
+				self.thread.start()
+			self.condition.notify()
+
+	def changes_for(self, accountId):
+		"""Returns a copy of all changes to an account which aren't committed yet, or None
+
+		Parameters
+		----------
+		accountId : str
+			id of the account document
+		"""
+
+		path = "accounts/{}".format(accountId)
+		with self.condition:
+			if path not in self.writing and path not in self.pending: return None
+			changes = copy.deepcopy(self.writing.get(path, {}))
+			if path in self.pending: merge_changes(changes, copy.deepcopy(self.pending[path]))
+		return changes
+
+	def run(self):
+		while True:
+			with self.condition:
+				while len(self.pending) == 0: self.condition.wait()
+			time.sleep(self.window)
+			self.flush()
+
+	def flush(self):
+		"""Writes all pending changes, returns False if some of them had to be rescheduled"""
+
+		with self.writeLock:
+			with self.condition:
+				pending, self.pending = self.pending, {}
+				self.writing = pending
+			try:
+				writes = list(pending.items())
+				for i in range(0, len(writes), self.batchSize):
+					if not self.commit(writes[i:i + self.batchSize]):
+						with self.condition:
+							for path, changes in writes[i:]:
+								self.pending[path] = merge_changes(changes, self.pending[path]) if path in self.pending else changes
+						return False
+			finally:
+				with self.condition:
+					self.writing = {}
+		return True
+
+	def commit(self, writes):
+		for attempt in range(self.retries):
+			try:
+				batch = self.database.batch()
+				for path, changes in writes:
+					batch.set(self.database.document(path), changes, merge=True)
+				batch.commit()
+				self.written += len(writes)
+				self.batches += 1
+				return True
+			except Exception:
+				self.retried += 1
+				if attempt == self.retries - 1:
+					print(traceback.format_exc())
+					if self.onError is not None: self.onError()
+				else:
+					time.sleep(min(0.5 * 2 ** attempt, 8))
+		return False
+
+	def metrics(self):
+		return {
+			"pending": len(self.pending),
+			"writing": len(self.writing),
+			"queued": self.queued,
+			"coalesced": self.coalesced,
+			"written": self.written,
+			"batches": self.batches,
+			"retried": self.retried
+		}
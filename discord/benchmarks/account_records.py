@@ -0,0 +1,68 @@
+"""Compares memory held by account documents mirrored as dictionaries and as compact account records
+
+Usage: python benchmarks/account_records.py [accounts]
+
+Synthetic accounts resemble production documents: every account has customer data and a few presets, some have
+market alerts, a paper trader with order history or API keys. Memory is measured with tracemalloc after all
+accounts are loaded, once with every record packed and once with the unpacked record cache full.
+"""
+
+import os
+import sys
+import copy
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from helpers.accounts import AccountRecord
+
+
+def account(generator, i):
+	properties = {
+		"customer": {"personalSubscription": {"subscription": "sub_{:016d}".format(i)} if generator.random() < 0.1 else {}, "addons": {"marketAlerts": 1} if generator.random() < 0.2 else {}, "communitySubscriptions": []},
+		"oauth": {"discord": {"userId": str(400000000000000000 + i), "tokenType": "Bearer"}},
+		"settings": {"messageProcessing": {"autodelete": generator.random() < 0.1}},
+		"commandPresets": [{"phrase": "preset {}".format(j), "shortcut": "c btc {}h".format(j + 1)} for j in range(generator.randint(0, 3))]
+	}
+	if generator.random() < 0.3:
+		properties["marketAlerts"] = {"CCXT": {"BTCUSD": [{"id": "{:032x}".format(generator.getrandbits(128)), "level": generator.uniform(1e4, 6e4), "timestamp": time.time()} for _ in range(generator.randint(1, 5))]}}
+	if generator.random() < 0.2:
+		history = [{"id": "{:032x}".format(generator.getrandbits(128)), "orderType": "buy", "amount": generator.random(), "price": generator.uniform(1e4, 6e4), "timestamp": time.time(), "base": "BTC", "quote": "USDT"} for _ in range(generator.randint(5, 80))]
+		properties["paperTrader"] = {"globalResetCount": 1, "globalLastReset": time.time(), "binance": {"balance": {"USDT": generator.uniform(0, 1e5), "BTC": generator.random()}, "openOrders": history[:5], "history": history}}
+	if generator.random() < 0.05:
+		properties["apiKeys"] = {"binance": {"id": "{:064x}".format(generator.getrandbits(256)), "secret": "{:064x}".format(generator.getrandbits(256))}}
+	return properties
+
+def measure(build):
+	tracemalloc.start()
+	start = time.perf_counter()
+	accounts = build()
+	elapsed = time.perf_counter() - start
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return accounts, size, elapsed
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	documents = [account(random.Random(i), i) for i in range(count)]
+
+	_, dictionarySize, dictionaryTime = measure(lambda: {i: copy.deepcopy(document) for i, document in enumerate(documents)})
+	records, recordSize, recordTime = measure(lambda: {i: AccountRecord(str(i), document) for i, document in enumerate(documents)})
+
+	tracemalloc.start()
+	for i in range(AccountRecord.cache.capacity):
+		if "paperTrader" in records[i]: records[i]["paperTrader"]
+	cacheSize, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	print("{:,} accounts".format(count))
+	print("{:<34} {:>12} {:>14} {:>10}".format("layout", "memory (MB)", "per account", "load (s)"))
+	print("{:<34} {:>12,.1f} {:>12,.0f} B {:>10,.2f}".format("document dictionaries", dictionarySize / 1048576, dictionarySize / count, dictionaryTime))
+	print("{:<34} {:>12,.1f} {:>12,.0f} B {:>10,.2f}".format("account records", recordSize / 1048576, recordSize / count, recordTime))
+	print("{:<34} {:>12,.1f}".format("+ {:,} unpacked records".format(AccountRecord.cache.capacity), cacheSize / 1048576))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,71 @@
+"""Compares command dispatch through the command table with the former startswith chain
+
+Usage: python benchmarks/dispatch.py [iterations]
+
+Each request is matched against the prefixes in the order the old `on_message` chain tested them and split with the
+uncompiled separator, then looked up in the command table and split with the precompiled one. Commands near the
+end of the chain (e.g. `paper`) paid for every preceding test.
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from helpers.commands import find_command, commands
+
+
+legacyChain = [
+	(("alpha ", "alpha, ", "@alpha ", "@alpha, "), None),
+	(("set ",), None),
+	(("preset ",), ", preset | preset"),
+	(("c ",), ", c | c |, "),
+	(("flow ",), ", flow | flow |, "),
+	(("hmap ",), ", hmap | hmap |, "),
+	(("d ",), ", d | d |, "),
+	(("alert ", "alerts "), ", alert | alert |, alerts | alerts |, "),
+	(("p ",), ", p | p |, "),
+	(("v ",), ", v | v |, "),
+	(("convert ",), ", convert | convert |, "),
+	(("m ", "info", "mcap ", "mc "), ", m | m |, info | info |, mcap | mcap |, mc | mc |, "),
+	(("t ", "top"), ", t | t |, top | top |, "),
+	(("mk ",), ", mk | mk |, "),
+	(("n ",), ", n | n |, "),
+	(("stream ",), ", stream | stream |, "),
+	(("x ",), ", x | x |, "),
+	(("paper ",), ", paper | paper |, "),
+]
+
+requests = ["alpha what is bitcoin", "c btc 1h", "c btc, eth 4h", "p eth", "v btc", "m eth", "top 10", "mk btc", "alerts list", "paper balance", "paper buy 1 btc"]
+
+def legacy_dispatch(content):
+	for prefixes, separator in legacyChain:
+		if content.startswith(prefixes):
+			return None if separator is None else re.split(separator, content.split(" ", 1)[1])
+
+def table_dispatch(content):
+	command = find_command(content)
+	if command is not None:
+		return None if command.separator is None else command.separator.split(content.split(" ", 1)[1])
+
+def measure(dispatch, content, iterations):
+	start = time.perf_counter()
+	for _ in range(iterations):
+		dispatch(content)
+	return (time.perf_counter() - start) / iterations
+
+def main():
+	iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+	print("{} registered command keywords".format(len(commands)))
+	print("{:<24} {:>12} {:>12} {:>9}".format("request", "chain (ns)", "table (ns)", "speedup"))
+	for content in requests:
+		legacy = measure(legacy_dispatch, content, iterations)
+		table = measure(table_dispatch, content, iterations)
+		print("{:<24} {:>12,.0f} {:>12,.0f} {:>8.1f}x".format(content, legacy * 1e9, table * 1e9, legacy / table))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,63 @@
+"""Compares parser index codecs by decode time and memory
+
+Usage: python benchmarks/parser_index_codec.py [snapshot path]
+
+Without a path, a synthetic index shaped like the CoinGecko and IEXC sections is generated. With a path to a local
+parser index snapshot, the real sections are re-encoded with every available codec.
+"""
+
+import os
+import sys
+import zlib
+import time
+import pickle
+import random
+import string
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from helpers.parser_index import ParserIndexCodec, ParserIndexSnapshot
+
+
+def synthetic_sections(size=100000):
+	random.seed(0)
+	coinGecko, stocks = {}, {}
+	for i in range(size):
+		symbol = "".join(random.choices(string.ascii_uppercase, k=random.randint(3, 5))) + str(i)
+		coinGecko[symbol] = {"id": symbol.lower(), "name": "{} Token".format(symbol.title()), "base": symbol, "quote": "USD", "image": "https://assets.coingecko.com/coins/images/{}/large/{}.png".format(i, symbol.lower()), "market_cap_rank": i}
+		stocks[symbol] = {"id": symbol, "name": "{} Incorporated".format(symbol.title()), "base": symbol, "quote": "USD", "exchange": random.choice(["NAS", "NYS", "PSE", "ASE"])}
+	return {"CoinGecko": coinGecko, "IEXC Stocks": stocks}
+
+def measure(blob, repeat=5):
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		ParserIndexCodec.decode(blob)
+		timings.append(time.perf_counter() - start)
+
+	tracemalloc.start()
+	section = ParserIndexCodec.decode(blob)
+	retained, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del section
+	return min(timings), retained, peak
+
+def main():
+	if len(sys.argv) > 1:
+		blobs, _ = ParserIndexSnapshot(sys.argv[1]).load()
+		sections = {name: ParserIndexCodec.decode(blob) for name, blob in blobs.items()}
+	else:
+		sections = synthetic_sections()
+
+	print("{:<12} {:>8} {:>12} {:>12} {:>14} {:>14}".format("section", "codec", "size (KiB)", "decode (ms)", "retained (MiB)", "peak (MiB)"))
+	for name, section in sections.items():
+		encodings = [("legacy", zlib.compress(pickle.dumps(section)))]
+		for version in sorted(ParserIndexCodec.codecs):
+			encodings.append(("v{}".format(version), ParserIndexCodec.encode(section, version=version)))
+		for codec, blob in encodings:
+			decodeTime, retained, peak = measure(blob)
+			print("{:<12} {:>8} {:>12,.0f} {:>12,.1f} {:>14,.1f} {:>14,.1f}".format(name, codec, len(blob) / 1024, decodeTime * 1000, retained / 1048576, peak / 1048576))
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,62 @@
+"""Measures how quickly ordinary chat is rejected before a message request is built
+
+Usage: python benchmarks/prefilter.py [iterations]
+
+The baseline repeats the work `on_message` did for every message before knowing whether it was a command:
+whitespace normalization, lowercasing, a linear scan of the user's presets and shortcut resolution. Shortcuts are
+resolved through the current alias table, not the former elif chain, so the baseline is the prelude as it runs
+today. Neither side includes `MessageRequest` construction or the blocked user checks, which rejected chat skips as
+well. The pre-filter only inspects the first word of the raw content.
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from helpers.utils import Utils
+from helpers.commands import may_be_request
+from helpers import constants
+
+
+chat = [
+	"gm everyone", "anyone watching the fed today?", "lol", "this is going to 100k for sure, trust me", "Has anyone tried the new exchange? The fees look really low",
+	"brb", "I bought the top again", "What do you think about ETH 2.0 staking rewards", "nice", "ok so what is the plan for tonight",
+	"wen lambo", "Just got liquidated on a 100x long :(", "@everyone check the announcements channel", "hodl", "Can someone explain funding rates to me like I'm five?"
+]
+requests = ["c btc", "p eth", "c btc 1h, 4h", "mex", "paper balance", "alpha what is the price of gold"]
+presets = [{"phrase": "my chart", "shortcut": "c btc 1h"}, {"phrase": "gold", "shortcut": "c xauusd"}]
+
+def baseline(content):
+	normalized = " ".join(content.split()).lower()
+	for preset in presets:
+		if preset["phrase"] == normalized: normalized = preset["shortcut"]
+	normalized, _, _ = Utils.shortcuts(normalized, True)
+	return normalized.startswith(tuple(constants.commandWakephrases))
+
+def prefilter(content):
+	return may_be_request(content, presets)
+
+def measure(check, corpus, iterations):
+	start = time.perf_counter()
+	for _ in range(iterations):
+		for content in corpus:
+			check(content)
+	return (time.perf_counter() - start) / (iterations * len(corpus))
+
+def main():
+	iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+	random.seed(0)
+	corpus = random.choices(chat, k=90) + random.choices(requests, k=10)
+
+	missed = [content for content in corpus if baseline(content) and not prefilter(content)]
+	print("requests rejected by the pre-filter: {}".format(len(missed)))
+	print("{:<20} {:>14} {:>14}".format("corpus", "baseline (ns)", "filter (ns)"))
+	for name, messages in [("chat only", chat), ("90% chat", corpus), ("requests only", requests)]:
+		print("{:<20} {:>14,.0f} {:>14,.0f}".format(name, measure(baseline, messages, iterations) * 1e9, measure(prefilter, messages, iterations) * 1e9))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,94 @@
+"""Compares the shortcut alias table with the former elif chain
+
+Usage: python benchmarks/shortcuts.py [iterations]
+
+Both resolvers are run over a corpus of ordinary requests, where no shortcut applies and the old chain tested
+every alias list, and of shortcut requests. Results of both resolvers are compared for every message, with
+deprecated shortcuts enabled and disabled.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from helpers.utils import Utils
+from helpers import constants
+
+
+def legacy_shortcuts(raw, allowsShortcuts):
+	initial = raw
+	isDeprecated = False
+	if allowsShortcuts:
+		if raw in ["mex"]: raw, isDeprecated = "p xbt, eth mex, xrp mex", True
+		elif raw in ["fut", "futs", "futures"]: raw, isDeprecated = "p futures", True
+		elif raw in ["funding", "fun"]: raw, isDeprecated = "p xbt fun, eth fun, xrp fun", True
+		elif raw in ["oi", "ov"]: raw, isDeprecated = "p xbt oi, eth oi, xrp oi", True
+		elif raw in ["mex xbt", "mex btc"]: raw, isDeprecated = "p xbt", True
+		elif raw in ["mex eth"]: raw, isDeprecated = "p eth mex", True
+		elif raw in ["mex xrp"]: raw, isDeprecated = "p xrp mex", True
+		elif raw in ["mex bch"]: raw, isDeprecated = "p bch mex", True
+		elif raw in ["mex ltc"]: raw, isDeprecated = "p ltc mex", True
+		elif raw in ["mex link"]: raw, isDeprecated = "p link mex", True
+		elif raw in ["mex eos"]: raw, isDeprecated = "p eos mex", True
+		elif raw in ["mex trx"]: raw, isDeprecated = "p trx mex", True
+		elif raw in ["mex ada"]: raw, isDeprecated = "p ada mex", True
+		elif raw in ["prem", "prems", "premiums"]: raw, isDeprecated = "p btc prems", True
+		elif raw in ["funding xbt", "fun xbt", "funding xbtusd", "fun xbtusd", "funding btc", "fun btc", "funding btcusd", "fun btcusd", "xbt funding", "xbt fun", "xbtusd funding", "xbtusd fun", "btc funding", "btc fun", "btcusd funding", "btcusd fun"]: raw, isDeprecated = "p xbt funding", True
+		elif raw in ["funding eth", "fun eth", "funding ethusd", "fun ethusd", "eth funding", "eth fun", "ethusd funding", "ethusd fun"]: raw, isDeprecated = "p eth funding", True
+		elif raw in ["funding xrp", "fun xrp", "funding xrpusd", "fun xrpusd", "xrp funding", "xrp fun", "xrpusd funding", "xrpusd fun"]: raw, isDeprecated = "p xrp funding", True
+		elif raw in ["funding bch", "fun bch", "funding bchusd", "fun bchusd", "bch funding", "bch fun", "bchusd funding", "bchusd fun"]: raw, isDeprecated = "p bch funding", True
+		elif raw in ["funding ltc", "fun ltc", "funding ltcusd", "fun ltcusd", "ltc funding", "ltc fun", "ltcusd funding", "ltcusd fun"]: raw, isDeprecated = "p ltc funding", True
+		elif raw in ["funding link", "fun link", "funding linkusd", "fun linkusd", "link funding", "link fun", "linkusd funding", "linkusd fun"]: raw, isDeprecated = "p link funding", True
+		elif raw in ["oi xbt", "oi xbtusd", "ov xbt", "ov xbtusd"]: raw, isDeprecated = "p xbt oi", True
+		elif raw in ["oi eth", "oi ethusd", "ov eth", "ov ethusd"]: raw, isDeprecated = "p eth oi", True
+		elif raw in ["oi xrp", "oi xrpusd", "ov xrp", "ov xrpusd"]: raw, isDeprecated = "p xrp oi", True
+		elif raw in ["oi bch", "oi bchusd", "ov bch", "ov bchusd"]: raw, isDeprecated = "p bch oi", True
+		elif raw in ["oi ltc", "oi ltcusd", "ov ltc", "ov ltcusd"]: raw, isDeprecated = "p ltc oi", True
+		elif raw in ["oi link", "oi linkusd", "ov link", "ov linkusd"]: raw, isDeprecated = "p link oi", True
+
+	shortcutUsed = initial != raw
+
+	if raw in ["!help", "?help"]: raw = "alpha help"
+	elif raw in ["!invite", "?invite"]: raw = "alpha invite"
+	elif raw in ["c internals", "c internal"]: raw = "c uvol-dvol w, tick, dvn-decn, pcc d line"
+	elif raw in ["c btc vol"]: raw = "c bvol"
+	elif raw in ["c mcap"]: raw = "c total nv"
+	elif raw in ["c alt mcap"]: raw = "c total2 nv"
+	elif raw in ["hmap"]: raw = "hmap change"
+	elif raw in ["flow"]: raw = "flow options"
+	elif raw in ["p gindex", "p gi", "p findex", "p fi", "p fgindex", "p fgi", "p gfindex", "p gfi"]: raw = "p am fgi"
+	elif raw in ["c gindex", "c gi", "c findex", "c fi", "c fgindex", "c fgi", "c gfindex", "c gfi"]: raw = "c am fgi"
+	elif raw in ["c nvtr", "c nvt", "c nvt ratio", "c nvtratio"]: raw = "c wc nvt"
+	elif raw in ["c drbns", "c drbn", "c rbns", "c rbn", "c dribbon", "c difficultyribbon"]: raw = "c wc drbn"
+	elif raw in ["p fut", "p futs", "p futures"]: raw = "p xbtz20, xbth21"
+
+	raw = raw.replace("line break", "break")
+
+	return raw, shortcutUsed, isDeprecated
+
+corpus = ["c btc", "p eth", "c btc 1h, 4h", "alpha what is the price of gold", "paper balance", "m link", "hmap", "mex", "fun eth", "oi link", "p fut", "fut", "!help", "c nvt ratio", "c btc line break"]
+
+def measure(resolver, corpus, iterations):
+	start = time.perf_counter()
+	for _ in range(iterations):
+		for raw in corpus:
+			resolver(raw, True)
+	return (time.perf_counter() - start) / (iterations * len(corpus))
+
+def main():
+	iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+	aliases = [alias for shortcuts in [constants.deprecatedShortcuts, constants.shortcuts] for aliasList in shortcuts.values() for alias in aliasList]
+	mismatches = [raw for raw in corpus + aliases for allowsShortcuts in [True, False] if legacy_shortcuts(raw, allowsShortcuts) != Utils.shortcuts(raw, allowsShortcuts)]
+	print("mismatched results: {}".format(len(mismatches)))
+
+	requests = [raw for raw in corpus if legacy_shortcuts(raw, True)[0] == raw]
+	print("{:<20} {:>12} {:>12}".format("corpus", "chain (ns)", "table (ns)"))
+	for name, messages in [("requests", requests), ("all shortcuts", aliases), ("mixed", corpus)]:
+		print("{:<20} {:>12,.0f} {:>12,.0f}".format(name, measure(legacy_shortcuts, messages, iterations) * 1e9, measure(Utils.shortcuts, messages, iterations) * 1e9))
+
+
+if __name__ == "__main__":
+	main()